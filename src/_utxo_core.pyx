@@ -0,0 +1,60 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional compiled version of the transaction checks in blockchain.py (_check_tx).
+
+blockchain.py imports it when it has been built and otherwise uses the pure-Python
+_check_tx with the same behaviour. Build in place (needs Cython and a C compiler):
+
+    cythonize -i src/_utxo_core.pyx
+"""
+from cpython.dict cimport PyDict_GetItemWithError
+from cpython.ref cimport PyObject
+
+
+cpdef tuple check_tx(list inputs, list outputs, dict utxos, set pending_spent=None, dict pending_added=None):
+    """
+    Validate inputs/outputs against utxos (plus the mempool overlay, if given).
+    Returns (None, keys) with the spent (txid, index) keys in input order, or (reason, None).
+    """
+    cdef Py_ssize_t k
+    cdef list keys = []
+    cdef set seen = set()
+    cdef object total_in = 0
+    cdef object total_out = 0
+    cdef object i, key, utxo, amt
+    cdef PyObject* found
+    for k in range(len(inputs)):
+        i = inputs[k]
+        key = (i["txid"], int(i["index"]))
+        if key in seen:
+            return "double spend within tx", None
+        seen.add(key)
+        utxo = None
+        if pending_spent is None or key not in pending_spent:
+            if pending_added is not None:
+                found = PyDict_GetItemWithError(pending_added, key)
+                if found is not NULL:
+                    utxo = <object>found
+            if utxo is None:
+                found = PyDict_GetItemWithError(utxos, key)
+                if found is not NULL:
+                    utxo = <object>found
+        if utxo is None:
+            return f"missing utxo {key}", None
+        if utxo.address != i["address"]:
+            return "ownership mismatch", None
+        amt = int(utxo.amount)
+        if amt <= 0:
+            return "invalid utxo amount", None
+        total_in += amt
+        keys.append(key)
+
+    for k in range(len(outputs)):
+        amt = int(outputs[k]["amount"])
+        if amt <= 0:
+            return "non-positive output", None
+        total_out += amt
+
+    if total_in < total_out:
+        return "outputs exceed inputs", None
+    return None, keys
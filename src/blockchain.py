@@ -11,15 +11,335 @@ NOTE: No cryptographic signatures in this assignment; addresses are plain string
 from __future__ import annotations
 import hashlib
 import json
+import multiprocessing
+import queue
+import re
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from json.encoder import encode_basestring as _json_str
 import time
 import os
-from typing import Any, Dict, List, Tuple, Optional
+from contextlib import ExitStack
+from array import array
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Tuple, Optional
 
+try:
+    import orjson  # optional: much faster persistence I/O
+except ImportError:
+    orjson = None
 
-def sha256_json(obj: Any) -> str:
+
+def canonical_json(obj: Any, sort_keys: bool = True) -> bytes:
+    """
+    Return the canonical JSON encoding of obj (sorted keys, no whitespace) as UTF-8.
+    sort_keys=False skips the per-dict sort; only use it when every dict in obj
+    was already built with its keys in sorted order.
+    """
+    return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def sha256_json(obj: Any, sort_keys: bool = True) -> str:
     """Return SHA256 hex of canonical JSON representation of obj."""
-    s = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
-    return hashlib.sha256(s.encode()).hexdigest()
+    return hashlib.sha256(canonical_json(obj, sort_keys)).hexdigest()
+
+
+def _dumps_indented(data: Any) -> bytes:
+    """Indented JSON as UTF-8 (orjson when available, stdlib json otherwise)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # e.g. an int beyond 64 bits; let stdlib json handle it (_loads reads it back)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode()
+
+
+def _write_json(path: str, data: Any):
+    """Write data as indented JSON."""
+    with open(path, "wb") as f:
+        f.write(_dumps_indented(data))
+
+
+def _dumps_compact(data: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# A JSON number with 19+ digits; orjson would decode one that doesn't fit 64 bits as a float.
+# Inside a string (e.g. a txid) it's a false positive, which only costs the slower decoder.
+_LONG_INT = re.compile(rb"(?:^|[\[:,\s-])\d{19}")
+
+
+def _loads(buf: bytes) -> Any:
+    """Decode JSON; stdlib json for buffers with big ints, so they come back as exact ints."""
+    if orjson is None or _LONG_INT.search(buf):
+        return json.loads(buf)
+    return orjson.loads(buf)
+
+
+# Append-only logs (chain.log, utxos.log) are sequences of [u32 little-endian length][JSON payload].
+_FRAME = struct.Struct("<I")
+
+
+def _iter_frames(f: BinaryIO) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield (payload, end) for each record of a framed log opened in binary mode, reading
+    one record at a time; `end` is the offset just past that record. A torn record at
+    the tail (interrupted append) is ignored.
+    """
+    pos = 0
+    while True:
+        header = f.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        (n,) = _FRAME.unpack(header)
+        payload = f.read(n)
+        if len(payload) < n:
+            return
+        pos += _FRAME.size + n
+        yield payload, pos
+
+
+def _append_frames(path: str, payloads: List[bytes], offset: int) -> Optional[int]:
+    """
+    Write records at `offset` (dropping anything after it, e.g. a torn tail); return the new end.
+    If the file is shorter than offset, records before it are gone: nothing is written and
+    None is returned, so the caller can write the whole log again from offset 0.
+    """
+    buf = b"".join(_FRAME.pack(len(p)) + p for p in payloads)
+    if not offset:
+        with open(path, "wb") as f:
+            f.write(buf)
+        return len(buf)
+    # O_APPEND: the records go out as one write at the end of the file
+    with open(path, "ab") as f:
+        end = f.tell()
+        if end < offset:
+            return None
+        if end > offset:
+            f.truncate(offset)
+        f.write(buf)
+    return offset + len(buf)
+
+
+# ------------------ Canonical encoding for tx / block hashing ------------------
+# Hand-rolled equivalents of canonical_json() specialized to the tx and block shapes.
+# They produce byte-identical output; anything off-schema falls back to canonical_json().
+
+def _canon_scalar(v: Any) -> str:
+    t = type(v)
+    if t is str:
+        return _json_str(v)
+    if t is int:
+        return int.__repr__(v)
+    return canonical_json(v).decode()
+
+
+def _canon_input(i: Dict[str, Any]) -> str:
+    try:
+        addr, index, txid = i["address"], i["index"], i["txid"]
+        if type(addr) is str and type(index) is int and type(txid) is str and len(i) == 3:
+            return '{"address":%s,"index":%d,"txid":%s}' % (_json_str(addr), index, _json_str(txid))
+    except (KeyError, TypeError):
+        pass
+    return canonical_json(i).decode()
+
+
+def _canon_output(o: Dict[str, Any]) -> str:
+    try:
+        addr, amount = o["address"], o["amount"]
+        if type(addr) is str and type(amount) is int and len(o) == 2:
+            return '{"address":%s,"amount":%d}' % (_json_str(addr), amount)
+    except (KeyError, TypeError):
+        pass
+    return canonical_json(o).decode()
+
+
+def _canon_tx_str(tx: Dict[str, Any]) -> str:
+    try:
+        inputs, outputs = tx["inputs"], tx["outputs"]
+        if type(inputs) is list and type(outputs) is list:
+            body = '"inputs":[%s],"outputs":[%s]' % (
+                ",".join(map(_canon_input, inputs)), ",".join(map(_canon_output, outputs)))
+            if len(tx) == 2:
+                return "{%s}" % body
+            if len(tx) == 3:
+                return '{%s,"txid":%s}' % (body, _canon_scalar(tx["txid"]))
+    except (KeyError, TypeError):
+        pass
+    return canonical_json(tx).decode()
+
+
+def _canon_tx(tx: Dict[str, Any]) -> bytes:
+    """Canonical JSON of a tx dict, either {"inputs","outputs"} or {"inputs","outputs","txid"}."""
+    return _canon_tx_str(tx).encode()
+
+
+def _canon_block_content(index: Any, txs_canon: bytes, timestamp: Any,
+                         previous_hash: Any) -> Tuple[bytes, bytes]:
+    """
+    Canonical JSON of block content split around the nonce: content = prefix + nonce + suffix.
+    txs_canon is the already-encoded transactions list.
+    """
+    prefix = ('{"index":%s,"nonce":' % _canon_scalar(index)).encode()
+    suffix = b"".join((
+        (',"previous_hash":%s,"timestamp":%s,"transactions":' % (
+            _canon_scalar(previous_hash), _canon_scalar(timestamp))).encode(),
+        txs_canon,
+        b"}",
+    ))
+    return prefix, suffix
+
+
+def _canon_tx_list(transactions: Any) -> bytes:
+    if type(transactions) is not list:
+        return canonical_json(transactions)
+    return ("[%s]" % ",".join(map(_canon_tx_str, transactions))).encode()
+
+
+# Streaming variants: the same bytes, handed to a hasher's update() as they are produced
+# instead of being joined into one buffer first.
+
+def _update_canon_tx(update: Callable[[bytes], None], tx: Any):
+    try:
+        inputs, outputs = tx["inputs"], tx["outputs"]
+        if type(inputs) is list and type(outputs) is list and len(tx) == 2:
+            update(b'{"inputs":[')
+            update(",".join(map(_canon_input, inputs)).encode())
+            update(b'],"outputs":[')
+            update(",".join(map(_canon_output, outputs)).encode())
+            update(b"]}")
+            return
+    except (KeyError, TypeError):
+        pass
+    update(_canon_tx(tx))
+
+
+def _update_canon_tx_list(update: Callable[[bytes], None], transactions: Any):
+    if type(transactions) is not list:
+        update(canonical_json(transactions))
+        return
+    update(b"[")
+    sep = b""
+    for tx in transactions:
+        update(sep)
+        update(_canon_tx_str(tx).encode())
+        sep = b","
+    update(b"]")
+
+
+def sha256_canon(obj: Any) -> str:
+    """sha256_json(obj), streamed into the hasher; fast path for tx dicts and lists of them."""
+    h = hashlib.sha256()
+    if type(obj) is list:
+        _update_canon_tx_list(h.update, obj)
+    else:
+        _update_canon_tx(h.update, obj)
+    return h.hexdigest()
+
+
+def _sha256_block(index: Any, nonce: Any, previous_hash: Any, timestamp: Any, transactions: Any) -> str:
+    """SHA256 hex of the canonical block content, streamed."""
+    h = hashlib.sha256(('{"index":%s,"nonce":%s,"previous_hash":%s,"timestamp":%s,"transactions":' % (
+        _canon_scalar(index), _canon_scalar(nonce), _canon_scalar(previous_hash),
+        _canon_scalar(timestamp))).encode())
+    _update_canon_tx_list(h.update, transactions)
+    h.update(b"}")
+    return h.hexdigest()
+
+
+# Optional Numba PoW backend (pow_numba.py), opted into with BLOCKCHAIN_POW_BACKEND=numba.
+# Falls back to the hashlib search below when numba/numpy are not installed.
+_numba_pow_search = None
+if os.environ.get("BLOCKCHAIN_POW_BACKEND", "").lower() == "numba":
+    try:
+        from pow_numba import pow_search as _numba_pow_search
+    except ImportError:
+        _numba_pow_search = None
+
+
+def _pow_target(difficulty: int) -> int:
+    """Digests (as big-endian ints) below this value start with `difficulty` zero hex digits."""
+    return 1 << (256 - 4 * difficulty)
+
+
+# Nonces tried per _pow_scan call; also how often a long search can check for cancellation.
+POW_BATCH = 4096
+
+
+def _pow_scan(h0: Any, suffix: bytes, target: int, nonces: range) -> Optional[Tuple[int, str]]:
+    """
+    Try every nonce in a range; return (nonce, hex digest) for the first hit or None.
+    h0/suffix come from Block._pow_prefix_and_midstate(). hashlib's OpenSSL backend
+    already picks SHA-NI / ARMv8 SHA2 at runtime, so this loop only trims Python
+    overhead per attempt (hoisted lookups, no str -> bytes round-trip for the nonce,
+    raw digest checked with one bytes comparison; hex is only built for the hit).
+    """
+    # digest < target as big-endian ints is digest <= (target - 1) as 32-byte strings,
+    # which also covers target == 2**256 (difficulty 0)
+    limit = (target - 1).to_bytes(32, "big")
+    copy = h0.copy
+    for nonce in nonces:
+        h = copy()
+        h.update(b"%d" % nonce)
+        h.update(suffix)
+        digest = h.digest()
+        if digest <= limit:
+            return nonce, digest.hex()
+    return None
+
+
+def _pow_search(h0: Any, suffix: bytes, target: int, start_nonce: int = 0) -> Tuple[int, str]:
+    """Scan nonces upward from start_nonce, POW_BATCH at a time, until one meets target."""
+    while True:
+        found = _pow_scan(h0, suffix, target, range(start_nonce, start_nonce + POW_BATCH))
+        if found is not None:
+            return found
+        start_nonce += POW_BATCH
+
+
+def _pow_worker(prefix: bytes, suffix: bytes, target: int, start: int, step: int,
+                found: Any, results: Any):
+    """Process entry point: scan nonces start, start+step, ... until found is set."""
+    h0 = hashlib.sha256(prefix)
+    span = POW_BATCH * step
+    while not found.is_set():
+        hit = _pow_scan(h0, suffix, target, range(start, start + span, step))
+        if hit is not None:
+            results.put(hit)
+            found.set()
+            return
+        start += span
+
+
+def _pow_search_parallel(prefix: bytes, suffix: bytes, target: int, workers: int) -> Tuple[int, str]:
+    """
+    Run the nonce search in `workers` processes, worker k trying k, k+N, k+2N, ...
+    The first hit wins; the others notice the shared event at their next batch boundary.
+    """
+    ctx = multiprocessing.get_context()
+    found = ctx.Event()
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_pow_worker, args=(prefix, suffix, target, k, workers, found, results),
+                         daemon=True)
+             for k in range(workers)]
+    for p in procs:
+        p.start()
+    try:
+        while True:
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                if not any(p.is_alive() for p in procs):
+                    raise RuntimeError("PoW workers exited without a result")
+    finally:
+        found.set()
+        for p in procs:
+            p.join()
 
 
 class Transaction:
@@ -29,13 +349,13 @@ class Transaction:
     outputs: list of {"amount": int, "address": str}
     """
     def __init__(self, inputs: List[Dict[str, Any]], outputs: List[Dict[str, Any]]):
-        self.inputs = inputs
-        self.outputs = outputs
+        # rebuild the dicts so the txid always covers exactly the schema fields
+        self.inputs = [{"address": i["address"], "index": i["index"], "txid": i["txid"]} for i in inputs]
+        self.outputs = [{"address": o["address"], "amount": o["amount"]} for o in outputs]
         self.txid = self.compute_txid()
 
     def compute_txid(self) -> str:
-        content = {"inputs": self.inputs, "outputs": self.outputs}
-        return sha256_json(content)
+        return sha256_canon({"inputs": self.inputs, "outputs": self.outputs})
 
     def to_dict(self) -> Dict[str, Any]:
         return {"txid": self.txid, "inputs": self.inputs, "outputs": self.outputs}
@@ -50,8 +370,38 @@ class Transaction:
         return tx
 
 
+class TxView(NamedTuple):
+    """A stored tx dict taken at its word: txid is read, not recomputed."""
+    inputs: List[Dict[str, Any]]
+    outputs: List[Dict[str, Any]]
+    txid: str
+
+
+def _as_view(txd: Dict[str, Any]) -> TxView:
+    return TxView(txd["inputs"], txd["outputs"], txd["txid"])
+
+
+def _txid_matches(txd: Any) -> bool:
+    """True if txd is well-formed and its stored txid is the hash of its inputs/outputs."""
+    try:
+        return txd["txid"] == Transaction(txd["inputs"], txd["outputs"]).txid
+    except (KeyError, TypeError):
+        return False
+
+
+def _intern_addresses(txd: Dict[str, Any]):
+    """Intern the input/output addresses of txd in place, like Utxo does for its address."""
+    for part in (txd["inputs"], txd["outputs"]):
+        for io in part:
+            if type(io) is dict and type(io.get("address")) is str:
+                io["address"] = sys.intern(io["address"])
+
+
 class Block:
     """Block structure holding transactions and PoW nonce/hash."""
+    # fields covered by the cached serialization in _content_parts()
+    _CONTENT_FIELDS = frozenset(("index", "transactions", "timestamp", "previous_hash"))
+
     def __init__(self, index: int, transactions: List[Dict[str, Any]], timestamp: float,
                  previous_hash: str, nonce: int = 0, difficulty: int = 3):
         self.index = index
@@ -62,26 +412,72 @@ class Block:
         self.hash: Optional[str] = None
         self.difficulty = difficulty
 
+    def __setattr__(self, name: str, value: Any):
+        if name in Block._CONTENT_FIELDS:
+            self.__dict__.pop("_content_cache", None)
+        self.__dict__.pop("_json", None)
+        object.__setattr__(self, name, value)
+
+    def _content_parts(self) -> Tuple[bytes, bytes]:
+        """
+        Cached (prefix, suffix) of the canonical content around the nonce.
+        Reassigning a content field drops the cache, but in-place edits of the
+        transaction dicts are not seen, so validation goes through compute_hash().
+        """
+        parts = self.__dict__.get("_content_cache")
+        if parts is None:
+            parts = _canon_block_content(self.index, _canon_tx_list(self.transactions),
+                                         self.timestamp, self.previous_hash)
+            self.__dict__["_content_cache"] = parts
+        return parts
+
     def compute_hash(self) -> str:
-        content = {
-            "index": self.index,
-            "transactions": self.transactions,
-            "timestamp": self.timestamp,
-            "previous_hash": self.previous_hash,
-            "nonce": self.nonce,
-        }
-        return sha256_json(content)
-
-    def mine(self, difficulty: Optional[int] = None):
-        """Simple Proof-of-Work loop: find nonce where hash starts with difficulty zeros."""
-        target = "0" * (difficulty if difficulty is not None else self.difficulty)
-        self.nonce = 0
-        h = self.compute_hash()
-        while not h.startswith(target):
-            self.nonce += 1
-            h = self.compute_hash()
-        self.hash = h
-        return h
+        """Hash of the current content, always re-serialized from the fields."""
+        return _sha256_block(self.index, self.nonce, self.previous_hash, self.timestamp, self.transactions)
+
+    def compute_hash_with_nonce(self, nonce: int) -> str:
+        """Hash of the content with the given nonce, reusing the cached serialization."""
+        prefix, suffix = self._content_parts()
+        h = hashlib.sha256(prefix)
+        h.update(b"%d" % nonce)
+        h.update(suffix)
+        return h.hexdigest()
+
+    def _pow_prefix_and_midstate(self):
+        """
+        Split the canonical content around the nonce for Proof-of-Work.
+        Returns (h0, suffix): h0 is a sha256 object that has already absorbed
+        everything before the nonce digits, suffix is everything after them.
+        Keys are sorted, so the layout is {"index":..,"nonce":<n>,"previous_hash":..,...}.
+        """
+        prefix, suffix = self._content_parts()
+        return hashlib.sha256(prefix), suffix
+
+    def mine(self, difficulty: Optional[int] = None, workers: int = 1):
+        """
+        Simple Proof-of-Work loop: find nonce where hash starts with difficulty zeros.
+        The block content is serialized once; each attempt only hashes the nonce and suffix
+        on a copy of the pre-hashed prefix.
+        workers > 1 splits the nonce space across that many processes (<= 0: one per CPU).
+        The found nonce is then valid but not necessarily the smallest one.
+        """
+        if difficulty is None:
+            difficulty = self.difficulty
+        target = _pow_target(difficulty)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        if workers > 1:
+            prefix, suffix = self._content_parts()
+            nonce, digest = _pow_search_parallel(prefix, suffix, target, workers)
+        elif _numba_pow_search is not None:
+            prefix, suffix = self._content_parts()
+            nonce, digest = _numba_pow_search(prefix, suffix, difficulty)
+        else:
+            h0, suffix = self._pow_prefix_and_midstate()
+            nonce, digest = _pow_search(h0, suffix, target)
+        self.nonce = nonce
+        self.hash = digest
+        return digest
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -96,7 +492,7 @@ class Block:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Block":
-        return cls(
+        block = cls(
             index=data["index"],
             transactions=data.get("transactions", []),
             timestamp=data.get("timestamp", time.time()),
@@ -104,6 +500,307 @@ class Block:
             nonce=data.get("nonce", 0),
             difficulty=data.get("difficulty", 3)
         )
+        block.hash = data.get("hash")
+        return block
+
+    def to_json(self) -> bytes:
+        """
+        Compact JSON of to_dict() (the chain.log record), cached on the block. Setting any
+        field drops it; in-place edits of the transaction dicts are not seen.
+        """
+        buf = self.__dict__.get("_json")
+        if buf is None:
+            buf = self.__dict__["_json"] = _dumps_compact(self.to_dict())
+        return buf
+
+    @classmethod
+    def from_json(cls, buf: bytes) -> "Block":
+        """from_dict() of a chain.log record, keeping the record as the to_json() cache."""
+        block = cls.from_dict(_loads(buf))
+        block.__dict__["_json"] = buf
+        return block
+
+
+class Utxo:
+    """
+    Unspent output entry stored in Blockchain.utxos. Slotted instead of a
+    {"amount", "address"} dict, with the address interned so outputs paying the same
+    address share one string.
+    """
+    __slots__ = ("amount", "address")
+
+    def __init__(self, amount: int, address: str):
+        self.amount = amount
+        self.address = sys.intern(address) if type(address) is str else address
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Utxo):
+            return NotImplemented
+        return self.amount == other.amount and self.address == other.address
+
+    def __repr__(self) -> str:
+        return f"Utxo(amount={self.amount!r}, address={self.address!r})"
+
+
+class UtxoSet:
+    """
+    Structure-of-arrays UTXO set used to replay the chain in is_chain_valid.
+    Each unspent output is a row: amounts[row] (signed 64-bit) and address_ids[row]
+    (index into the interned `addresses` table); `rows` maps (txid, index) -> row and
+    spent rows are recycled. Avoids a {"amount", "address"} dict per entry.
+    """
+    __slots__ = ("rows", "amounts", "address_ids", "addresses", "_address_id", "_free")
+
+    def __init__(self):
+        self.rows: Dict[Tuple[str, int], int] = {}
+        self.amounts = array("q")
+        self.address_ids = array("I")
+        self.addresses: List[str] = []
+        self._address_id: Dict[str, int] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self.rows
+
+    def row_of(self, key: Tuple[str, int]) -> int:
+        """Row of an unspent output, or -1."""
+        return self.rows.get(key, -1)
+
+    def address(self, row: int) -> str:
+        return self.addresses[self.address_ids[row]]
+
+    def add(self, key: Tuple[str, int], amount: int, address: str):
+        """Insert an output; raises OverflowError if amount does not fit in 64 bits."""
+        addr_id = self._address_id.get(address)
+        if addr_id is None:
+            addr_id = self._address_id[address] = len(self.addresses)
+            self.addresses.append(address)
+        row = self.rows.get(key)
+        if row is None and self._free:
+            row = self._free.pop()
+        if row is None:
+            self.amounts.append(amount)
+            self.address_ids.append(addr_id)
+            row = len(self.amounts) - 1
+        else:
+            self.amounts[row] = amount
+            self.address_ids[row] = addr_id
+        self.rows[key] = row
+
+    def spend(self, key: Tuple[str, int]) -> bool:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return False
+        self._free.append(row)
+        return True
+
+    def apply(self, tx: Any) -> Tuple[bool, Optional[str]]:
+        """
+        Validate a (non-coinbase) tx against the set and, if it passes, spend its inputs and
+        add its outputs. Input rows are resolved in one pass and the amount/ownership
+        checks run as whole-list min()/sum()/compare over the columns.
+        """
+        inputs = tx.inputs
+        keys = [(i["txid"], int(i["index"])) for i in inputs]
+        if len(set(keys)) != len(keys):
+            return False, "double spend within tx"
+        rows = list(map(self.rows.get, keys))
+        if None in rows:
+            return False, f"missing utxo {keys[rows.index(None)]}"
+        address_ids = self.address_ids
+        if [address_ids[row] for row in rows] != list(map(self._address_id.get, [i["address"] for i in inputs])):
+            return False, "ownership mismatch"
+        in_amounts = list(map(self.amounts.__getitem__, rows))
+        if in_amounts and min(in_amounts) <= 0:
+            return False, "invalid utxo amount"
+        out_amounts = [int(o["amount"]) for o in tx.outputs]
+        if out_amounts and min(out_amounts) <= 0:
+            return False, "non-positive output"
+        if sum(in_amounts) < sum(out_amounts):
+            return False, "outputs exceed inputs"
+
+        self._free.extend(map(self.rows.pop, keys))
+        txid = tx.txid
+        for idx, (o, amt) in enumerate(zip(tx.outputs, out_amounts)):
+            self.add((txid, idx), amt, o["address"])
+        return True, None
+
+    def to_dict(self) -> Dict[Tuple[str, int], Utxo]:
+        """The same contents in the Blockchain.utxos dict layout."""
+        return {key: Utxo(self.amounts[row], self.address(row)) for key, row in self.rows.items()}
+
+
+# utxos.log records written before save_to_file takes a fresh utxos.json snapshot instead.
+UTXO_SNAPSHOT_EVERY = 100
+
+# Smallest mempool for which mine() spreads validation over mining_workers processes.
+PARALLEL_VALIDATION_MIN = 512
+
+
+def _check_tx(inputs: List[Dict[str, Any]], outputs: List[Dict[str, Any]], utxos: Dict[Tuple[str, int], Utxo],
+              pending_spent: Optional[set] = None,
+              pending_added: Optional[Dict[Tuple[str, int], Utxo]] = None) -> Tuple[Optional[str], Optional[list]]:
+    """
+    Validate inputs/outputs against utxos (plus the mempool overlay, if given).
+    Returns (None, keys) with the spent (txid, index) keys in input order, or (reason, None).
+    """
+    keys = []
+    seen = set()
+    total_in = 0
+    for i in inputs:
+        key = (i["txid"], int(i["index"]))
+        if key in seen:
+            return "double spend within tx", None
+        seen.add(key)
+        if pending_spent is not None and key in pending_spent:
+            utxo = None
+        else:
+            utxo = (pending_added.get(key) if pending_added is not None else None) or utxos.get(key)
+        if utxo is None:
+            return f"missing utxo {key}", None
+        if utxo.address != i["address"]:
+            return "ownership mismatch", None
+        amt = int(utxo.amount)
+        if amt <= 0:
+            return "invalid utxo amount", None
+        total_in += amt
+        keys.append(key)
+
+    total_out = 0
+    for o in outputs:
+        amt = int(o["amount"])
+        if amt <= 0:
+            return "non-positive output", None
+        total_out += amt
+
+    if total_in < total_out:
+        return "outputs exceed inputs", None
+    return None, keys
+
+
+# Compiled _check_tx, if _utxo_core.pyx has been built (see that file).
+try:
+    from _utxo_core import check_tx as _check_tx
+except ImportError:
+    pass
+
+
+def _conflict_groups(txds: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Union-find over outpoints: txs that spend or create the same (txid, index) end up in
+    one group. Returns groups of mempool positions, each ascending, ordered by first position.
+    """
+    parent = list(range(len(txds)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    owner: Dict[Tuple[Any, int], int] = {}
+    for pos, txd in enumerate(txds):
+        try:
+            keys = {(i["txid"], int(i["index"])) for i in txd["inputs"]}  # TypeError if unhashable
+            keys.update((txd["txid"], idx) for idx in range(len(txd["outputs"])))
+        except (KeyError, TypeError, ValueError):
+            continue  # malformed: stays in its own group and fails validation there
+        for key in keys:
+            other = owner.setdefault(key, pos)
+            if other != pos:
+                parent[find(pos)] = find(other)
+
+    groups: Dict[int, List[int]] = {}
+    for pos in range(len(txds)):
+        groups.setdefault(find(pos), []).append(pos)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def _validate_groups(batch: List[Tuple[List[int], List[Dict[str, Any]], Dict[Tuple[str, int], Utxo]]]
+                     ) -> List[Tuple[int, TxView]]:
+    """Process-pool task: validate each group in order against its referenced utxos."""
+    passed = []
+    for positions, txds, utxos in batch:
+        for pos, txd in zip(positions, txds):
+            # a malformed tx (e.g. a non-integer index) is rejected like in the sequential pass
+            try:
+                tx_obj = _as_view(txd)
+                ok, _ = Blockchain._validate_and_apply_to_utxo(tx_obj, utxos)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if ok:
+                passed.append((pos, tx_obj))
+    return passed
+
+
+def _validate_parallel(txds: List[Dict[str, Any]], lookup: Callable[[Tuple[str, int]], Optional[Utxo]],
+                       workers: int) -> List[Tuple[int, TxView]]:
+    """
+    Validate txds, in order, in up to `workers` processes. Txs are grouped into conflict-free
+    components (no shared outpoint, counting the outputs a tx creates), so each group validates
+    independently against just the utxos it references, as lookup(key) returns them.
+    Returns (position, TxView) for the txs that pass, in position order, matching a sequential pass.
+    """
+    groups = _conflict_groups(txds)
+    if not groups:
+        return []
+    batches: List[List[Tuple[List[int], List[Dict[str, Any]], Dict[Tuple[str, int], Utxo]]]] = \
+        [[] for _ in range(min(workers, len(groups)))]
+    for n, positions in enumerate(groups):
+        group = [txds[pos] for pos in positions]
+        referenced = {}
+        for txd in group:
+            for i in txd.get("inputs", ()):
+                try:
+                    key = (i["txid"], int(i["index"]))
+                    utxo = lookup(key)  # TypeError for an unhashable txid
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if utxo is not None:
+                    referenced[key] = utxo
+        batches[n % len(batches)].append((positions, group, referenced))
+
+    passed: List[Tuple[int, TxView]] = []
+    with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+        for result in pool.map(_validate_groups, batches):
+            passed.extend(result)
+    passed.sort(key=lambda item: item[0])
+    return passed
+
+
+class _UtxoJournal:
+    """
+    Undo log for in-place UTXO updates: the original entries of spent keys and the
+    keys that were added. rollback() restores the UTXO dict; committing is just
+    dropping the journal.
+    """
+    def __init__(self):
+        self.removed: Dict[Tuple[str, int], Utxo] = {}
+        self.added: set = set()
+
+    def spend(self, utxos: Dict[Tuple[str, int], Utxo], key: Tuple[str, int]):
+        old = utxos.pop(key, None)
+        if old is None:
+            return
+        if key in self.added:
+            # created and spent under this journal: rollback just has nothing to undo
+            self.added.discard(key)
+        else:
+            self.removed.setdefault(key, old)
+
+    def add(self, utxos: Dict[Tuple[str, int], Utxo], key: Tuple[str, int], entry: Utxo):
+        utxos[key] = entry
+        self.added.add(key)
+
+    def rollback(self, utxos: Dict[Tuple[str, int], Utxo]):
+        for key in self.added:
+            utxos.pop(key, None)
+        utxos.update(self.removed)
+        self.added.clear()
+        self.removed.clear()
 
 
 class Blockchain:
@@ -111,87 +808,141 @@ class Blockchain:
     Minimal blockchain with:
     - chain: list of Block
     - unconfirmed_transactions: mempool (list of tx dicts)
-    - utxos: dict[(txid, index)] -> {"amount": int, "address": str}
+    - utxos: dict[(txid, index)] -> Utxo(amount, address)
+    - _by_addr: dict[address] -> dict[(txid, index)] -> amount, the same utxos by owner
+    - mempool overlay: confirmed utxos spent by the mempool (_mempool_spent) and
+      outputs created by it (_mempool_outputs), kept in step with unconfirmed_transactions
+    - _mp_delta: dict[address] -> net balance change the mempool would make
+
+    On disk: chain.log is append-only (one framed record per block), utxos.json is a
+    snapshot of the UTXO set and utxos.log holds the per-block changes made since that
+    snapshot; mempool.json is rewritten whole. A legacy chain.json is still read.
     """
     def __init__(self, data_dir: str = os.path.join(os.path.dirname(__file__), "..", "data"),
-                 difficulty: int = 3, block_reward: int = 50):
+                 difficulty: int = 3, block_reward: int = 50, mining_workers: int = 1):
         self.chain: List[Block] = []
         self.unconfirmed_transactions: List[Dict[str, Any]] = []
-        self.utxos: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.utxos: Dict[Tuple[str, int], Utxo] = {}
+        self._by_addr: Dict[str, Dict[Tuple[str, int], int]] = {}
+        self._mempool_spent: set = set()
+        self._mempool_outputs: Dict[Tuple[str, int], Utxo] = {}
+        self._mp_delta: Dict[str, int] = {}
         self.difficulty = difficulty
         self.block_reward = block_reward
+        self.mining_workers = mining_workers
 
         # persistence paths
         os.makedirs(data_dir, exist_ok=True)
-        self.chain_path = os.path.join(data_dir, "chain.json")
+        self.chain_path = os.path.join(data_dir, "chain.log")
+        self.legacy_chain_path = os.path.join(data_dir, "chain.json")
         self.utxo_path = os.path.join(data_dir, "utxos.json")
+        self.utxo_log_path = os.path.join(data_dir, "utxos.log")
         self.mempool_path = os.path.join(data_dir, "mempool.json")
 
-        # If no files, create a genesis block automatically
-        if not (os.path.exists(self.chain_path) and os.path.exists(self.utxo_path)):
+        # what is already on disk, so save_to_file only writes what changed
+        self._saved_blocks = 0
+        self._saved_tip: Optional[Block] = None
+        self._chain_log_end = 0
+        self._saved_utxos: Optional[Dict[Tuple[str, int], Utxo]] = None
+        self._utxo_log_end = 0
+        self._utxo_log_records = 0
+        self._utxo_deltas: List[bytes] = []
+        self._saved_mempool: Optional[List[Dict[str, Any]]] = None
+        self._saved_mempool_len = 0
+
+        # validation cache for is_chain_valid(incremental=True): the last block a replay
+        # accepted (index, object, hash) and the UtxoSet state after it
+        self._validated_upto_index = -1
+        self._validated_tip: Optional[Block] = None
+        self._validated_tip_hash: Optional[str] = None
+        self._validated_utxos: Optional[UtxoSet] = None
+
+        # Load the files; start from a new genesis block only if nothing has been saved yet.
+        # Files that exist but can't be loaded raise to the caller and are left untouched.
+        if not self.load_from_file():
+            present = [p for p in (self.chain_path, self.legacy_chain_path, self.utxo_path)
+                       if os.path.exists(p)]
+            if present:
+                raise ValueError(f"incomplete blockchain data: only {', '.join(present)} found")
+            self.chain = []
+            self.utxos = {}
+            self.unconfirmed_transactions = []
+            self._rebuild_mempool_overlay()
             self.create_genesis_block()
             self.save_to_file()
-        else:
-            # if files exist, try to load
-            try:
-                self.load_from_file()
-            except Exception:
-                # fallback: create genesis
-                self.chain = []
-                self.utxos = {}
-                self.unconfirmed_transactions = []
-                self.create_genesis_block()
-                self.save_to_file()
+        # in-memory state now matches the files; callers need not load_from_file() again
+        self._loaded = True
 
     # ------------------ UTXO helpers ------------------
 
-    def _clone_utxo(self) -> Dict[Tuple[str, int], Dict[str, Any]]:
-        return {k: v.copy() for k, v in self.utxos.items()}
-
-    def _validate_and_apply_to_utxo(self, tx: Transaction, utxo_view: Dict[Tuple[str, int], Dict[str, Any]]) -> Tuple[bool, Optional[str]]:
+    @staticmethod
+    def _validate_and_apply_to_utxo(tx: Any, utxo_view: Any,
+                                    pending: Optional[Tuple[set, Dict[Tuple[str, int], Utxo]]] = None,
+                                    journal: Optional[_UtxoJournal] = None) -> Tuple[bool, Optional[str]]:
         """
-        Validate a Transaction against a provided utxo_view (dictionary).
+        Validate a Transaction or TxView against a provided utxo_view (dictionary or UtxoSet).
         If valid, apply changes to utxo_view (consume inputs, add outputs).
+        With pending=(spent, added) the mempool overlay sits on top of utxo_view:
+        lookups see `added` first and skip keys in `spent`, and the changes are
+        recorded in the overlay while utxo_view itself is left untouched.
+        With a journal, changes made to utxo_view are recorded so they can be rolled back.
         """
         # coinbase cannot be in mempool
         if tx.inputs and tx.inputs[0].get("txid") == "COINBASE":
             return False, "coinbase not allowed in mempool"
 
-        total_in = 0
-        seen_inputs = set()
-        for i in tx.inputs:
-            key = (i["txid"], int(i["index"]))
-            if key in seen_inputs:
-                return False, "double spend within tx"
-            seen_inputs.add(key)
-            utxo = utxo_view.get(key)
-            if utxo is None:
-                return False, f"missing utxo {key}"
-            if utxo["address"] != i["address"]:
-                return False, "ownership mismatch"
-            amt = int(utxo["amount"])
-            if amt <= 0:
-                return False, "invalid utxo amount"
-            total_in += amt
-
-        total_out = 0
-        for o in tx.outputs:
-            amt = int(o["amount"])
-            if amt <= 0:
-                return False, "non-positive output"
-            total_out += amt
-
-        if total_in < total_out:
-            return False, "outputs exceed inputs"
+        if isinstance(utxo_view, UtxoSet):
+            return utxo_view.apply(tx)
+        pending_spent, pending_added = pending if pending is not None else (None, None)
+        err, seen_inputs = _check_tx(tx.inputs, tx.outputs, utxo_view, pending_spent, pending_added)
+        if err is not None:
+            return False, err
 
         # apply: remove inputs, add outputs
-        for i in tx.inputs:
-            key = (i["txid"], int(i["index"]))
-            utxo_view.pop(key, None)
-        for idx, o in enumerate(tx.outputs):
-            utxo_view[(tx.txid, idx)] = {"amount": int(o["amount"]), "address": o["address"]}
+        if pending is not None:
+            for key in seen_inputs:
+                if pending_added.pop(key, None) is None:
+                    pending_spent.add(key)
+            for idx, o in enumerate(tx.outputs):
+                pending_added[(tx.txid, idx)] = Utxo(int(o["amount"]), o["address"])
+        elif journal is not None:
+            for key in seen_inputs:
+                journal.spend(utxo_view, key)
+            for idx, o in enumerate(tx.outputs):
+                journal.add(utxo_view, (tx.txid, idx), Utxo(int(o["amount"]), o["address"]))
+        else:
+            for key in seen_inputs:
+                utxo_view.pop(key, None)
+            for idx, o in enumerate(tx.outputs):
+                utxo_view[(tx.txid, idx)] = Utxo(int(o["amount"]), o["address"])
         return True, None
 
+    def _rebuild_addr_index(self):
+        """Recompute _by_addr from utxos."""
+        by_addr: Dict[str, Dict[Tuple[str, int], int]] = {}
+        for key, utxo in self.utxos.items():
+            by_addr.setdefault(utxo.address, {})[key] = utxo.amount
+        self._by_addr = by_addr
+
+    def _rebuild_mempool_overlay(self):
+        """Recompute the mempool overlay by replaying unconfirmed_transactions over utxos."""
+        self._mempool_spent = set()
+        self._mempool_outputs = {}
+        pending = (self._mempool_spent, self._mempool_outputs)
+        for txd in self.unconfirmed_transactions:
+            # malformed stored entries (e.g. a non-integer index) are skipped, not fatal to the load
+            try:
+                self._validate_and_apply_to_utxo(_as_view(txd), self.utxos, pending)
+            except (KeyError, TypeError, ValueError):
+                continue
+        delta: Dict[str, int] = {}
+        for key in self._mempool_spent:
+            utxo = self.utxos[key]
+            delta[utxo.address] = delta.get(utxo.address, 0) - utxo.amount
+        for utxo in self._mempool_outputs.values():
+            delta[utxo.address] = delta.get(utxo.address, 0) + utxo.amount
+        self._mp_delta = delta
+
     # ------------------ Chain / mempool operations ------------------
 
     def create_genesis_block(self, miner_address: str = "alice"):
@@ -205,64 +956,171 @@ class Blockchain:
             nonce=0,
             difficulty=self.difficulty
         )
-        genesis_block.mine(self.difficulty)
+        genesis_block.mine(self.difficulty, workers=self.mining_workers)
         self.chain = [genesis_block]
         # set utxos from coinbase
         self.utxos = {}
         for idx, o in enumerate(coinbase.outputs):
-            self.utxos[(coinbase.txid, idx)] = {"amount": int(o["amount"]), "address": o["address"]}
+            self.utxos[(coinbase.txid, idx)] = Utxo(int(o["amount"]), o["address"])
+        self._rebuild_addr_index()
 
     def add_new_transaction(self, tx: Dict[str, Any]) -> bool:
         """
         Add transaction to mempool if it validates against current utxos + pending mempool effects.
         Prevents double-spending with mempool.
         """
+        if not self._try_add_transaction(tx):
+            return False
+        self.save_to_file()
+        return True
+
+    def _try_add_transaction(self, tx: Dict[str, Any]) -> bool:
+        """add_new_transaction without the save."""
+        tx_obj = self._mempool_candidate(tx)
+        if tx_obj is None:
+            return False
+
+        # validate against confirmed utxos + the effects of txs already in the mempool
+        if tx_obj.inputs and tx_obj.inputs[0].get("txid") == "COINBASE":
+            return False  # coinbase cannot be in mempool
+        try:
+            err, keys = _check_tx(tx_obj.inputs, tx_obj.outputs, self.utxos,
+                                  self._mempool_spent, self._mempool_outputs)
+        except Exception:
+            return False
+        if err is not None:
+            return False
+
+        # all good -> append to mempool
+        self._admit_to_mempool(tx_obj, keys)
+        return True
+
+    def add_new_transactions(self, txs: List[Dict[str, Any]], workers: int = 1) -> List[bool]:
+        """
+        add_new_transaction for each of txs in order, saving once at the end. With workers > 1
+        (0 = one per CPU) and at least PARALLEL_VALIDATION_MIN txs, validation is spread over
+        processes by conflict-free group (see _validate_parallel); the outcome is the same.
+        """
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        if workers <= 1 or len(txs) < PARALLEL_VALIDATION_MIN:
+            results = [self._try_add_transaction(tx) for tx in txs]
+            if any(results):
+                self.save_to_file()
+            return results
+
+        # txids are needed up front: a tx's outputs are outpoints other txs may spend
+        candidates: List[Tuple[int, Transaction]] = []
+        for pos, tx in enumerate(txs):
+            tx_obj = self._mempool_candidate(tx)
+            if tx_obj is not None:
+                candidates.append((pos, tx_obj))
+        spent, added = self._mempool_spent, self._mempool_outputs
+        utxos = self.utxos
+        passed = _validate_parallel(
+            [tx_obj.to_dict() for _, tx_obj in candidates],
+            lambda key: None if key in spent else added.get(key) or utxos.get(key),
+            workers)
+
+        results = [False] * len(txs)
+        for n, _ in passed:
+            pos, tx_obj = candidates[n]
+            self._admit_to_mempool(tx_obj, [(i["txid"], int(i["index"])) for i in tx_obj.inputs])
+            results[pos] = True
+        if passed:
+            self.save_to_file()
+        return results
+
+    @staticmethod
+    def _mempool_candidate(tx: Any) -> Optional[Transaction]:
+        """tx as a Transaction, or None if it is malformed or carries a txid that doesn't match."""
         try:
             tx_obj = Transaction(inputs=tx["inputs"], outputs=tx["outputs"])
             if "txid" in tx and tx["txid"] != tx_obj.txid:
-                return False
+                return None
         except Exception:
-            return False
+            return None
+        return tx_obj
 
-        # create temp view and apply existing mempool txs to it
-        temp_utxo = self._clone_utxo()
-        for pending in self.unconfirmed_transactions:
-            pending_tx = Transaction(pending["inputs"], pending["outputs"])
-            ok, _ = self._validate_and_apply_to_utxo(pending_tx, temp_utxo)
-            if not ok:
-                # If a pending tx is invalid against current utxo, skip (shouldn't normally happen)
-                pass
-
-        ok, err = self._validate_and_apply_to_utxo(tx_obj, temp_utxo)
-        if not ok:
-            return False
-
-        # all good -> append to mempool and persist
+    def _admit_to_mempool(self, tx_obj: Transaction, keys: List[Tuple[str, int]]):
+        """Append a validated tx spending `keys` to the mempool, its overlay and _mp_delta."""
+        delta = self._mp_delta
+        for key in keys:
+            utxo = self._mempool_outputs.pop(key, None)
+            if utxo is None:
+                utxo = self.utxos[key]
+                self._mempool_spent.add(key)
+            delta[utxo.address] = delta.get(utxo.address, 0) - utxo.amount
+        for idx, o in enumerate(tx_obj.outputs):
+            utxo = Utxo(int(o["amount"]), o["address"])
+            self._mempool_outputs[(tx_obj.txid, idx)] = utxo
+            delta[utxo.address] = delta.get(utxo.address, 0) + utxo.amount
         self.unconfirmed_transactions.append(tx_obj.to_dict())
-        self.save_to_file()
-        return True
 
     def mine(self, miner_address: str) -> int:
         """
         Build a new block with a coinbase tx + as many valid mempool txs as possible.
         Update utxos and append block to chain.
         """
+        # everything up to a mined block changes self.utxos in place through the journal;
+        # if any of it fails or is interrupted, the journal puts the UTXO set back
+        journal = _UtxoJournal()
+        try:
+            new_block, included = self._build_block(miner_address, journal)
+        except BaseException:
+            journal.rollback(self.utxos)
+            raise
+
+        # append block; the utxo changes are already in place, queue them for utxos.log
+        self.chain.append(new_block)
+        self._utxo_deltas.append(_dumps_compact({
+            "spent": [list(key) for key in journal.removed],
+            "added": [[key[0], key[1], self.utxos[key].amount, self.utxos[key].address]
+                      for key in journal.added],
+        }))
+        for key, old in journal.removed.items():
+            owned = self._by_addr.get(old.address)
+            if owned is not None:
+                owned.pop(key, None)
+                if not owned:
+                    del self._by_addr[old.address]
+        for key in journal.added:
+            utxo = self.utxos[key]
+            self._by_addr.setdefault(utxo.address, {})[key] = utxo.amount
+
+        # remove included txs from mempool and persist
+        included_txids = {t.get("txid") for t in included}
+        self.unconfirmed_transactions = [t for t in self.unconfirmed_transactions
+                                         if t.get("txid") not in included_txids]
+        self._rebuild_mempool_overlay()
+        self.save_to_file()
+
+        return new_block.index
+
+    def _build_block(self, miner_address: str, journal: _UtxoJournal) -> Tuple[Block, List[Dict[str, Any]]]:
+        """
+        Coinbase + the mempool txs that validate, applied to self.utxos through journal,
+        in a block with its PoW done. Returns (block, included mempool txs).
+        """
         # coinbase (height = next index)
         coinbase_tx = Transaction.coinbase(miner_address, self.block_reward, height=len(self.chain))
         txs_to_include: List[Dict[str, Any]] = [coinbase_tx.to_dict()]
 
-        # use temp utxo applying coinbase first so mempool txs validated against that view
-        temp_utxo = self._clone_utxo()
-        # add coinbase outputs to temp_utxo
+        # apply coinbase first so mempool txs are validated against that view
         for idx, o in enumerate(coinbase_tx.outputs):
-            temp_utxo[(coinbase_tx.txid, idx)] = {"amount": int(o["amount"]), "address": o["address"]}
+            journal.add(self.utxos, (coinbase_tx.txid, idx), Utxo(int(o["amount"]), o["address"]))
 
-        included = []
-        for txd in self.unconfirmed_transactions:
-            tx_obj = Transaction(txd["inputs"], txd["outputs"])
-            ok, _ = self._validate_and_apply_to_utxo(tx_obj, temp_utxo)
-            if ok:
-                included.append(txd)
+        workers = self.mining_workers if self.mining_workers > 0 else (os.cpu_count() or 1)
+        if workers > 1 and len(self.unconfirmed_transactions) >= PARALLEL_VALIDATION_MIN:
+            included = self._include_mempool_parallel(journal, workers)
+        else:
+            included = []
+            for txd in self.unconfirmed_transactions:
+                try:
+                    ok, _ = self._validate_and_apply_to_utxo(_as_view(txd), self.utxos, journal=journal)
+                except (KeyError, TypeError, ValueError):
+                    continue  # malformed entry: left out like any other invalid tx
+                if ok:
+                    included.append(txd)
 
         txs_to_include.extend(included)
 
@@ -277,23 +1135,68 @@ class Blockchain:
         )
 
         # mine PoW
-        new_block.mine(self.difficulty)
+        new_block.mine(self.difficulty, workers=self.mining_workers)
+        return new_block, included
 
-        # append block & commit temp_utxo to real utxos
-        self.chain.append(new_block)
-        self.utxos = temp_utxo
-
-        # remove included txs from mempool and persist
-        self.unconfirmed_transactions = [t for t in self.unconfirmed_transactions if t not in included]
-        self.save_to_file()
+    def _include_mempool_parallel(self, journal: _UtxoJournal, workers: int) -> List[Dict[str, Any]]:
+        """
+        Validate the mempool in `workers` processes (see _validate_parallel) and apply the
+        passing txs to utxos in mempool order.
+        """
+        mempool = self.unconfirmed_transactions
+        passed = _validate_parallel(mempool, self.utxos.get, workers)
 
-        return new_block.index
+        included = []
+        for pos, tx_obj in passed:
+            for i in tx_obj.inputs:
+                journal.spend(self.utxos, (i["txid"], int(i["index"])))
+            for idx, o in enumerate(tx_obj.outputs):
+                journal.add(self.utxos, (tx_obj.txid, idx), Utxo(int(o["amount"]), o["address"]))
+            included.append(mempool[pos])
+        return included
 
     # ------------------ Validation & persistence ------------------
 
-    def is_chain_valid(self) -> bool:
-        temp_utxo: Dict[Tuple[str, int], Dict[str, Any]] = {}
-        for i, b in enumerate(self.chain):
+    def is_chain_valid(self, incremental: bool = False) -> bool:
+        """
+        Replay the chain from genesis: links, hashes, PoW and every transaction.
+        With incremental=True the replay resumes after the last block a previous call
+        accepted, as long as that block is still in place and both its stored and its
+        recomputed hash are unchanged (so edits to that block are caught). Blocks before
+        it are not re-hashed, so in-place edits to them are only caught by a full run.
+        """
+        start, temp_utxo = 0, None
+        upto = self._validated_upto_index
+        tip = self._validated_tip
+        if (incremental and 0 <= upto < len(self.chain) and self.chain[upto] is tip
+                and tip.hash == self._validated_tip_hash and tip.compute_hash() == tip.hash):
+            start, temp_utxo = upto + 1, self._validated_utxos
+        # the cached UtxoSet is advanced in place, so drop it until this replay succeeds
+        self._invalidate_validation_cache()
+        if temp_utxo is None:
+            temp_utxo = UtxoSet()
+        try:
+            ok = self._replay_chain(start, temp_utxo)
+        except OverflowError:
+            # an amount that does not fit the UtxoSet's 64-bit column
+            return False
+        if ok and self.chain:
+            self._validated_upto_index = len(self.chain) - 1
+            self._validated_tip = self.chain[-1]
+            self._validated_tip_hash = self._validated_tip.hash
+            self._validated_utxos = temp_utxo
+        return ok
+
+    def _invalidate_validation_cache(self):
+        self._validated_upto_index = -1
+        self._validated_tip = None
+        self._validated_tip_hash = None
+        self._validated_utxos = None
+
+    def _replay_chain(self, start: int, temp_utxo: UtxoSet) -> bool:
+        target = _pow_target(self.difficulty)
+        for i in range(start, len(self.chain)):
+            b = self.chain[i]
             if i == 0:
                 # genesis checks
                 if b.previous_hash != "0":
@@ -304,14 +1207,14 @@ class Blockchain:
                 if b.transactions:
                     coinbase = Transaction(b.transactions[0]["inputs"], b.transactions[0]["outputs"])
                     for idx, o in enumerate(coinbase.outputs):
-                        temp_utxo[(coinbase.txid, idx)] = {"amount": int(o["amount"]), "address": o["address"]}
+                        temp_utxo.add((coinbase.txid, idx), int(o["amount"]), o["address"])
                 continue
             prev = self.chain[i - 1]
             if b.previous_hash != prev.hash:
                 return False
             if b.compute_hash() != b.hash:
                 return False
-            if not b.hash.startswith("0" * self.difficulty):
+            if int(b.hash, 16) >= target:
                 return False
             # apply transactions
             for idx_tx, txd in enumerate(b.transactions):
@@ -320,7 +1223,7 @@ class Blockchain:
                     if idx_tx != 0:
                         return False
                     for out_index, o in enumerate(tx.outputs):
-                        temp_utxo[(tx.txid, out_index)] = {"amount": int(o["amount"]), "address": o["address"]}
+                        temp_utxo.add((tx.txid, out_index), int(o["amount"]), o["address"])
                     continue
                 ok, _ = self._validate_and_apply_to_utxo(tx, temp_utxo)
                 if not ok:
@@ -328,41 +1231,152 @@ class Blockchain:
         return True
 
     def save_to_file(self):
-        """Persist chain, utxos and mempool to disk (JSON)."""
+        """
+        Persist chain, utxos and mempool to disk. New blocks are appended to chain.log and
+        UTXO changes to utxos.log; the chain log and the UTXO snapshot are only rewritten
+        when the in-memory chain/utxos were replaced, or every UTXO_SNAPSHOT_EVERY records.
+        mempool.json is only rewritten when the mempool changed, so saving unchanged state
+        writes nothing.
+        """
         # chain
-        with open(self.chain_path, "w", encoding="utf-8") as f:
-            json.dump([b.to_dict() for b in self.chain], f, ensure_ascii=False, indent=2)
+        n = self._saved_blocks
+        if n and n <= len(self.chain) and self.chain[n - 1] is self._saved_tip:
+            new_blocks, offset = self.chain[n:], self._chain_log_end
+        else:
+            new_blocks, offset = self.chain, 0
+        if new_blocks or not offset:
+            end = _append_frames(self.chain_path, [b.to_json() for b in new_blocks], offset)
+            if end is None:
+                # chain.log lost records since it was last read or written: write it out in full
+                end = _append_frames(self.chain_path, [b.to_json() for b in self.chain], 0)
+            self._chain_log_end = end
+        self._saved_blocks = len(self.chain)
+        self._saved_tip = self.chain[-1] if self.chain else None
 
-        # utxos as a list of records
-        utxo_serial = [
-            {"txid": k[0], "index": k[1], "amount": v["amount"], "address": v["address"]}
-            for k, v in self.utxos.items()
-        ]
-        with open(self.utxo_path, "w", encoding="utf-8") as f:
-            json.dump(utxo_serial, f, ensure_ascii=False, indent=2)
+        # utxos: delta records, or a fresh snapshot
+        snapshot = (self._saved_utxos is not self.utxos
+                    or self._utxo_log_records + len(self._utxo_deltas) > UTXO_SNAPSHOT_EVERY)
+        if not snapshot and self._utxo_deltas:
+            end = _append_frames(self.utxo_log_path, self._utxo_deltas, self._utxo_log_end)
+            if end is None:
+                snapshot = True  # utxos.log lost records since it was last read or written
+            else:
+                self._utxo_log_end = end
+                self._utxo_log_records += len(self._utxo_deltas)
+        if snapshot:
+            # one [txid, index, amount, address] record per utxo, like the utxos.log records
+            utxo_serial = [[k[0], k[1], v.amount, v.address] for k, v in self.utxos.items()]
+            tmp_path = self.utxo_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps_compact(utxo_serial))
+            os.replace(tmp_path, self.utxo_path)
+            self._utxo_log_end = _append_frames(self.utxo_log_path, [], 0)
+            self._utxo_log_records = 0
+            self._saved_utxos = self.utxos
+        self._utxo_deltas = []
 
-        # mempool
-        with open(self.mempool_path, "w", encoding="utf-8") as f:
-            json.dump(self.unconfirmed_transactions, f, ensure_ascii=False, indent=2)
+        # mempool: rewritten whole, but only if it changed (txs are appended to the list
+        # in place; anything else replaces the list)
+        mempool = self.unconfirmed_transactions
+        if mempool is not self._saved_mempool or len(mempool) != self._saved_mempool_len:
+            _write_json(self.mempool_path, mempool)
+            self._saved_mempool, self._saved_mempool_len = mempool, len(mempool)
 
-    def load_from_file(self):
-        """Load chain, utxos and mempool from disk. If files missing, do nothing."""
-        # chain
-        if os.path.exists(self.chain_path):
-            with open(self.chain_path, "r", encoding="utf-8") as f:
-                chain_data = json.load(f)
-            self.chain = [Block.from_dict(b) for b in chain_data]
-        # utxos
-        if os.path.exists(self.utxo_path):
-            with open(self.utxo_path, "r", encoding="utf-8") as f:
-                utxo_serial = json.load(f)
+    @staticmethod
+    def _append_loaded_block(chain: List[Block], block: Block):
+        """Append a block read from disk, failing fast if it does not link to the one before it."""
+        if chain:
+            prev = chain[-1]
+            # hash is None in files written before from_dict restored it; that link can't be checked here
+            if prev.hash is not None and block.previous_hash != prev.hash:
+                raise ValueError(f"block {block.index} does not link to block {prev.index}")
+        chain.append(block)
+
+    def load_from_file(self) -> bool:
+        """
+        Load chain, utxos and mempool from disk; missing files are skipped. Returns True if
+        both a chain file and a UTXO snapshot were found. If mempool entries were dropped
+        while loading, mempool.json is rewritten without them.
+        """
+        with ExitStack() as stack:
+            def open_if_present(path: str) -> Optional[BinaryIO]:
+                try:
+                    return stack.enter_context(open(path, "rb"))
+                except FileNotFoundError:
+                    return None
+
+            chain_f = open_if_present(self.chain_path)
+            legacy_chain_f = open_if_present(self.legacy_chain_path) if chain_f is None else None
+            utxo_f = open_if_present(self.utxo_path)
+            mempool_f = open_if_present(self.mempool_path)
+            self.load_from_fileobj(chain_f, utxo_f,
+                                   open_if_present(self.utxo_log_path) if utxo_f is not None else None,
+                                   mempool_f, legacy_chain=legacy_chain_f)
+        loaded = (chain_f is not None or legacy_chain_f is not None) and utxo_f is not None
+        if loaded and mempool_f is not None and self._saved_mempool is not self.unconfirmed_transactions:
+            # keep the file to what the mempool holds: show-mempool prints it without loading
+            _write_json(self.mempool_path, self.unconfirmed_transactions)
+            self._saved_mempool = self.unconfirmed_transactions
+            self._saved_mempool_len = len(self.unconfirmed_transactions)
+        return loaded
+
+    def load_from_fileobj(self, chain: Optional[BinaryIO], utxos: Optional[BinaryIO],
+                          utxo_log: Optional[BinaryIO] = None, mempool: Optional[BinaryIO] = None,
+                          legacy_chain: Optional[BinaryIO] = None):
+        """
+        Load state from open binary files: chain.log, utxos.json, utxos.log, mempool.json
+        and, used only when chain is None, a legacy chain.json. None skips that part.
+        """
+        self._invalidate_validation_cache()
+        # chain: parsed one record at a time, checking each link as it arrives
+        if chain is not None:
+            blocks: List[Block] = []
+            self._chain_log_end = 0
+            for buf, self._chain_log_end in _iter_frames(chain):
+                self._append_loaded_block(blocks, Block.from_json(buf))
+            self.chain = blocks
+            self._saved_blocks = len(self.chain)
+        elif legacy_chain is not None:
+            blocks = []
+            for data in _loads(legacy_chain.read()):
+                self._append_loaded_block(blocks, Block.from_dict(data))
+            self.chain = blocks
+            self._saved_blocks = 0  # next save writes chain.log from scratch
+        self._saved_tip = self.chain[-1] if self._saved_blocks else None
+        # utxos: snapshot + replay of the delta log
+        if utxos is not None:
+            utxo_serial = _loads(utxos.read())
             self.utxos = {}
-            # utxo_serial expected to be list of {"txid":..., "index":..., "amount":..., "address":...}
-            if isinstance(utxo_serial, list):
+            # utxo_serial expected to be list of [txid, index, amount, address] records, or the
+            # older list of {"txid":..., "index":..., "amount":..., "address":...}
+            if isinstance(utxo_serial, list) and utxo_serial and type(utxo_serial[0]) is list:
+                self.utxos = {(txid, index): Utxo(amount, address)
+                              for txid, index, amount, address in utxo_serial}
+            elif isinstance(utxo_serial, list):
                 for item in utxo_serial:
-                    self.utxos[(item["txid"], int(item["index"]))] = {"amount": int(item["amount"]), "address": item["address"]}
+                    self.utxos[(item["txid"], int(item["index"]))] = Utxo(int(item["amount"]), item["address"])
+            self._utxo_log_end = 0
+            self._utxo_log_records = 0
+            if utxo_log is not None:
+                for buf, self._utxo_log_end in _iter_frames(utxo_log):
+                    delta = _loads(buf)
+                    for txid, index in delta["spent"]:
+                        self.utxos.pop((txid, index), None)
+                    for txid, index, amount, address in delta["added"]:
+                        self.utxos[(txid, index)] = Utxo(amount, address)
+                    self._utxo_log_records += 1
+            self._saved_utxos = self.utxos
+            self._utxo_deltas = []
+            self._rebuild_addr_index()
         # mempool
-        if os.path.exists(self.mempool_path):
-            with open(self.mempool_path, "r", encoding="utf-8") as f:
-                self.unconfirmed_transactions = json.load(f)
-
+        if mempool is not None:
+            # mempool txids are trusted from here on, so entries that don't hash to theirs are dropped
+            stored = _loads(mempool.read())
+            self.unconfirmed_transactions = [t for t in stored if _txid_matches(t)]
+            # the same few addresses recur across pending txs and the utxos; share one string each
+            for t in self.unconfirmed_transactions:
+                _intern_addresses(t)
+            if len(self.unconfirmed_transactions) == len(stored):
+                self._saved_mempool = self.unconfirmed_transactions
+                self._saved_mempool_len = len(stored)
+        self._rebuild_mempool_overlay()
@@ -4,43 +4,198 @@ Usage:
 python src/cli.py init
 python src/cli.py mine --miner alice
 python src/cli.py new-tx --from alice --to bob --amount 10
+python src/cli.py new-tx --batch txs.json [--workers 4]
 python src/cli.py show-mempool
+python src/cli.py show-chain [--pretty]
 python src/cli.py balance --addr alice
 python src/cli.py balance --addr bob
+python src/cli.py balance --addr alice --addr bob --json
 """
 from __future__ import annotations
-import argparse
+import functools
+import heapq
 import os
-import json
-from typing import Tuple
+import pickle
+import shutil
+import sys
+from typing import TYPE_CHECKING, List, NamedTuple, Tuple
 
-# import the revised blockchain implementation
-from blockchain import Blockchain, Transaction
+# blockchain is imported inside the handlers that need it, so --help and
+# argument errors don't pay for it
+if TYPE_CHECKING:
+    from blockchain import Blockchain
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
-CHAIN_PATH = os.path.join(DATA_DIR, "chain.json")
-UTXO_PATH = os.path.join(DATA_DIR, "utxos.json")
-MEMPOOL_PATH = os.path.join(DATA_DIR, "mempool.json")
-os.makedirs(DATA_DIR, exist_ok=True)
+class _Paths(NamedTuple):
+    data_dir: str
+    chain: str
+    legacy_chain: str
+    utxos: str
+    utxo_log: str
+    mempool: str
+    cache: str  # pickled Blockchain from the last run, reused while the files above are unchanged
+
+
+@functools.cache
+def _paths() -> _Paths:
+    """Data file locations. Resolved, and the data dir created, on first use rather than at import."""
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+    os.makedirs(data_dir, exist_ok=True)
+    return _Paths(
+        data_dir=data_dir,
+        chain=os.path.join(data_dir, "chain.log"),
+        legacy_chain=os.path.join(data_dir, "chain.json"),
+        utxos=os.path.join(data_dir, "utxos.json"),
+        utxo_log=os.path.join(data_dir, "utxos.log"),
+        mempool=os.path.join(data_dir, "mempool.json"),
+        cache=os.path.join(data_dir, ".cache.pkl"),
+    )
+
+
+# Bump when the cached Blockchain changes shape in a way the blockchain.py stat in the key
+# would not show (e.g. cli.py starts relying on a new attribute).
+CACHE_VERSION = 1
+
+
+def _state_key() -> Tuple:
+    """
+    Cache format and Python version, the resolved data dir, then (mtime_ns, size) of
+    blockchain.py, which defines the pickled classes, and of every persistence file (None
+    for missing ones). The pickled Blockchain holds absolute paths to the files it saves
+    to, so a copy of the project (e.g. cp -a, which keeps mtimes) must not reuse it.
+    """
+    paths = _paths()
+    key: list = [CACHE_VERSION, sys.version_info[:2], os.path.realpath(paths.data_dir)]
+    for path in (os.path.join(os.path.dirname(__file__), "blockchain.py"),
+                 paths.chain, paths.legacy_chain, paths.utxos, paths.utxo_log, paths.mempool):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            key.append(None)
+        else:
+            key.append((st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+
+def _write_cache(bc: Blockchain):
+    """Pickle bc next to the files it was loaded from/saved to, preceded by its own pickled key."""
+    cache_path = _paths().cache
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(_state_key(), f, protocol=5)
+            pickle.dump(bc, f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # the cache is only an optimization
 
 
 def load_blockchain() -> Blockchain:
-    """Instantiate Blockchain and load persisted files if they exist."""
-    bc = Blockchain(data_dir=DATA_DIR)
-    # Blockchain constructor already tries to load; ensure load_from_file to be explicit
+    """
+    Instantiate Blockchain and load persisted files if they exist. If the data files (and
+    blockchain.py) are unchanged since the last run, the pickled Blockchain from .cache.pkl
+    is used instead. Unpickling can run arbitrary code, so the data dir must only be
+    writable by whoever runs the CLI.
+    """
+    key = _state_key()
     try:
-        bc.load_from_file()
+        with open(_paths().cache, "rb") as f:
+            # the key is checked before the Blockchain is unpickled, so a stale object is never loaded
+            if pickle.load(f) == key:
+                return pickle.load(f)
     except Exception:
-        pass
+        pass  # missing, stale format or unreadable: load from the data files
+
+    bc = _new_blockchain()
+    # the constructor already loads (or creates) the state; only load again if it didn't
+    if not getattr(bc, "_loaded", False):
+        try:
+            bc.load_from_file()
+        except Exception:
+            pass
+    _write_cache(bc)
     return bc
 
 
+def _new_blockchain() -> Blockchain:
+    """Blockchain over the data dir; exits with a message if the files there can't be loaded."""
+    from blockchain import Blockchain
+    try:
+        return Blockchain(data_dir=_paths().data_dir)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        sys.exit(f"Cannot load the blockchain in {_paths().data_dir}: {e!r}\n"
+                 "The files were left as they are; move them away to start a new chain.")
+
+
+def _read_batch(path: str) -> list:
+    """The txs in a new-tx --batch file; exits with a message if it isn't a readable JSON list."""
+    from blockchain import _loads
+    try:
+        with open(path, "rb") as f:
+            txs = _loads(f.read())
+    except (OSError, ValueError) as e:
+        sys.exit(f"Cannot read the --batch file {path}: {e}")
+    if not isinstance(txs, list):
+        sys.exit(f"The --batch file {path} must hold a JSON list of transactions, not {type(txs).__name__}")
+    return txs
+
+
 def save_blockchain(bc: Blockchain):
     """Persist blockchain state (chain, utxos, mempool)."""
     bc.save_to_file()
 
 
+def print_balances(bc: Blockchain, addrs: List[str], as_json: bool = False):
+    """One line per address: text, or {"addr": ..., "balance": ...} JSON lines."""
+    if as_json:
+        from blockchain import _dumps_compact
+        out = sys.stdout.buffer
+        sys.stdout.flush()
+    for addr in addrs:
+        # confirmed UTXOs plus the net effect of the mempool
+        total = sum(bc._by_addr.get(addr, {}).values()) + bc._mp_delta.get(addr, 0)
+        if as_json:
+            out.write(_dumps_compact({"addr": addr, "balance": total}) + b"\n")
+        else:
+            print(f"Balance of {addr}: {total}")
+    if as_json:
+        out.flush()
+
+
+def print_mempool():
+    """
+    Copy mempool.json to stdout as is. save_to_file keeps it in step with the mempool and
+    already writes it indented, so the chain doesn't need loading nor the JSON re-encoding.
+    """
+    try:
+        f = open(_paths().mempool, "rb")
+    except FileNotFoundError:
+        print("Mempool is empty.")
+        return
+    with f:
+        head = f.read(64)
+        if head.strip() in (b"", b"[]"):
+            print("Mempool is empty.")
+            return
+        out = sys.stdout.buffer
+        sys.stdout.flush()
+        out.write(head)
+        shutil.copyfileobj(f, out)
+        out.write(b"\n")
+        out.flush()
+
+
 def main():
+    # fast path for the polling commands: exact `balance --addr X` / `show-mempool`
+    # skip importing argparse and building the parser
+    argv = sys.argv[1:]
+    if len(argv) == 3 and argv[:2] == ["balance", "--addr"] and not argv[2].startswith("-"):
+        print_balances(load_blockchain(), [argv[2]])
+        return
+    if argv == ["show-mempool"]:
+        print_mempool()
+        return
+
+    import argparse
     parser = argparse.ArgumentParser(description="Blockchain CLI")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -48,84 +203,110 @@ def main():
 
     mine_parser = subparsers.add_parser("mine", help="Mine a new block")
     mine_parser.add_argument("--miner", required=True, help="Miner address")
+    mine_parser.add_argument("--workers", type=int, default=1,
+                             help="Processes to split the PoW search across (0 = one per CPU)")
 
     tx_parser = subparsers.add_parser("new-tx", help="Create new transaction")
-    tx_parser.add_argument("--from", dest="from_addr", required=True)
-    tx_parser.add_argument("--to", dest="to_addr", required=True)
-    tx_parser.add_argument("--amount", type=int, required=True)
+    tx_parser.add_argument("--from", dest="from_addr")
+    tx_parser.add_argument("--to", dest="to_addr")
+    tx_parser.add_argument("--amount", type=int)
+    tx_parser.add_argument("--batch", metavar="FILE",
+                           help='Add the txs in a JSON list of {"inputs": [...], "outputs": [...]} instead')
+    tx_parser.add_argument("--workers", type=int, default=1,
+                           help="Processes to validate a --batch across (0 = one per CPU)")
 
     bal_parser = subparsers.add_parser("balance", help="Check address balance")
-    bal_parser.add_argument("--addr", required=True)
+    bal_parser.add_argument("--addr", action="append", required=True, help="Address (repeat for several)")
+    bal_parser.add_argument("--json", action="store_true", help='Print {"addr": ..., "balance": ...} JSON lines')
 
-    subparsers.add_parser("show-chain", help="Show full blockchain")
+    chain_parser = subparsers.add_parser("show-chain", help="Show full blockchain (a JSON array, one block per line)")
+    chain_parser.add_argument("--pretty", action="store_true", help="Indent each block")
     subparsers.add_parser("show-mempool", help="Show pending transactions")
 
     args = parser.parse_args()
-    bc = load_blockchain()
+    if args.command == "new-tx" and args.batch is None and None in (args.from_addr, args.to_addr, args.amount):
+        tx_parser.error("--from, --to and --amount are required without --batch")
+    # read the batch before loading the chain, so a bad file fails fast
+    txs = _read_batch(args.batch) if args.command == "new-tx" and args.batch is not None else None
+    # init builds its own Blockchain below; show-mempool reads mempool.json directly
+    bc = load_blockchain() if args.command not in ("init", "show-mempool") else None
 
     if args.command == "init":
         # fresh Blockchain() already creates genesis if needed
-        bc = Blockchain(data_dir=DATA_DIR)
+        bc = _new_blockchain()
         save_blockchain(bc)
         print("Blockchain initialized.")
 
     elif args.command == "mine":
-        idx = bc.mine(miner_address=args.miner)
-        save_blockchain(bc)
+        bc.mining_workers = args.workers
+        idx = bc.mine(miner_address=args.miner)  # persists the new block itself
+        _write_cache(bc)
         print(f"Mined block #{idx}")
 
+    elif args.command == "new-tx" and args.batch is not None:
+        results = bc.add_new_transactions(txs, workers=args.workers)  # persists the mempool itself
+        _write_cache(bc)
+        for n, ok in enumerate(results):
+            if not ok:
+                print(f"Transaction #{n} invalid!")
+        print(f"{sum(results)} of {len(results)} transactions added to mempool.")
+
     elif args.command == "new-tx":
-        # Find spendable UTXOs for from_addr
-        spendables = [((txid, idx), utxo) for (txid, idx), utxo in bc.utxos.items() if utxo["address"] == args.from_addr]
-        total_amt = sum(utxo["amount"] for _, utxo in spendables)
+        # Find spendable UTXOs for from_addr (skipping ones a pending tx already spends)
+        # as a max-heap of (-amount, (txid, idx))
+        spendables = [(-amount, key) for key, amount in bc._by_addr.get(args.from_addr, {}).items()
+                      if key not in bc._mempool_spent]
         if not spendables:
             print("No UTXO for this address.")
             return
+        # only whether they cover the amount matters, so stop adding once they do
+        total_amt = 0
+        for neg, _ in spendables:
+            total_amt -= neg
+            if total_amt >= args.amount:
+                break
         if total_amt < args.amount:
             print("Insufficient balance.")
             return
 
-        # Use first available UTXO (simple selection)
-        (txid, idx), utxo = spendables[0]
-        inputs = [{"txid": txid, "index": idx, "address": args.from_addr}]
+        # Greedy selection: largest UTXOs first until they cover the amount
+        heapq.heapify(spendables)
+        inputs = []
+        selected_amt = 0
+        while selected_amt < args.amount:
+            neg, (txid, idx) = heapq.heappop(spendables)
+            inputs.append({"txid": txid, "index": idx, "address": args.from_addr})
+            selected_amt -= neg
         outputs = [{"amount": args.amount, "address": args.to_addr}]
-        change = utxo["amount"] - args.amount
+        change = selected_amt - args.amount
         if change > 0:
             outputs.append({"amount": change, "address": args.from_addr})
 
+        from blockchain import Transaction
         tx = Transaction(inputs=inputs, outputs=outputs).to_dict()
-        ok = bc.add_new_transaction(tx)
+        ok = bc.add_new_transaction(tx)  # persists the mempool itself
+        _write_cache(bc)
         print("Transaction added to mempool." if ok else "Transaction invalid!")
-        save_blockchain(bc)
 
     elif args.command == "balance":
-        # confirmed UTXOs
-        total = sum(utxo["amount"] for _, utxo in bc.utxos.items() if utxo["address"] == args.addr)
-
-        # adjust for unconfirmed transactions (mempool)
-        for txd in bc.unconfirmed_transactions:
-            # subtract spent inputs (look up amounts from confirmed UTXOs if present)
-            for inp in txd["inputs"]:
-                if inp["address"] == args.addr:
-                    key = (inp["txid"], int(inp["index"]))
-                    # if the input refers to an existing confirmed UTXO, subtract it
-                    total -= bc.utxos.get(key, {}).get("amount", 0)
-            # add unconfirmed outputs to address
-            for out in txd["outputs"]:
-                if out["address"] == args.addr:
-                    total += out["amount"]
-
-        print(f"Balance of {args.addr}: {total}")
+        print_balances(bc, args.addr, args.json)
 
     elif args.command == "show-chain":
-        for b in bc.chain:
-            print(json.dumps(b.to_dict(), indent=2, ensure_ascii=False))
+        # written block by block as UTF-8 bytes, compact unless --pretty; the compact form is
+        # each block's cached chain.log record
+        from blockchain import _dumps_indented
+        out = sys.stdout.buffer
+        sys.stdout.flush()
+        out.write(b"[\n")
+        last = len(bc.chain) - 1
+        for i, b in enumerate(bc.chain):
+            out.write(_dumps_indented(b.to_dict()) if args.pretty else b.to_json())
+            out.write(b",\n" if i < last else b"\n")
+        out.write(b"]\n")
+        out.flush()
 
     elif args.command == "show-mempool":
-        if not bc.unconfirmed_transactions:
-            print("Mempool is empty.")
-        else:
-            print(json.dumps(bc.unconfirmed_transactions, indent=2, ensure_ascii=False))
+        print_mempool()
 
 
 if __name__ == "__main__":
@@ -14,36 +14,29 @@ import os
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 os.makedirs(DATA_DIR, exist_ok=True)
-CHAIN_PATH = os.path.join(DATA_DIR, "chain.json")
+CHAIN_PATH = os.path.join(DATA_DIR, "chain.log")
 UTXO_PATH = os.path.join(DATA_DIR, "utxos.json")
 
 def print_balances(bc: Blockchain, addresses):
-    # naive balance calc by scanning UTXO set
-    totals = {a: 0 for a in addresses}
-    for (txid, idx), utxo in bc.utxos.items():
-        addr = utxo["address"]
-        if addr in totals:
-            totals[addr] += int(utxo["amount"])
+    # balances from the address -> utxos index
+    totals = {a: sum(bc._by_addr.get(a, {}).values()) for a in addresses}
     print("Balances:", totals)
 
 def find_spendable_utxos(bc: Blockchain, address: str):
-    items = [((txid, idx), utxo) for (txid, idx), utxo in bc.utxos.items() if utxo["address"] == address]
-    return items
+    return list(bc._by_addr.get(address, {}).items())
 
 def main():
     bc = Blockchain(difficulty=3, block_reward=50)
 
     print("Mining first block for miner1...")
     bc.mine(miner_address="miner1")
-    print("Chain valid?", bc.is_chain_valid())
+    print("Chain valid?", bc.is_chain_valid(incremental=True))
     print_balances(bc, ["miner1", "bob"])
 
     # create a transaction spending miner1's UTXO to bob
     spendables = find_spendable_utxos(bc, "miner1")
     assert spendables, "no utxo for miner1"
-    (txid, idx), utxo = spendables[0]
-
-    amt = utxo["amount"]
+    (txid, idx), amt = spendables[0]
     tx1 = Transaction(
         inputs=[{"txid": txid, "index": idx, "address": "miner1"}],
         outputs=[{"amount": amt, "address": "bob"}]
@@ -64,11 +57,11 @@ def main():
     # mine a new block including tx1
     print("Mining second block for miner1...")
     bc.mine(miner_address="miner1")
-    print("Chain valid?", bc.is_chain_valid())
+    print("Chain valid?", bc.is_chain_valid(incremental=True))
     print_balances(bc, ["miner1", "bob"])
 
-    # file persist (JSON)
-    bc.save_to_file(CHAIN_PATH, UTXO_PATH)
+    # file persist (append-only chain log + UTXO snapshot)
+    bc.save_to_file()
     print("Saved to", CHAIN_PATH, "and", UTXO_PATH)
 
     # Tamper test: modify amount in block 1 transaction (if exists) and re-check validity
@@ -0,0 +1,161 @@
+"""
+Optional Numba backend for the Proof-of-Work nonce search.
+
+blockchain.py uses it when BLOCKCHAIN_POW_BACKEND=numba is set and numba/numpy
+are importable; otherwise mining stays on hashlib.
+
+The kernel is a plain SHA-256 over prefix + ascii(nonce) + suffix. Whole blocks
+before the nonce digits are compressed once (midstate) and the suffix/padding is
+only laid out again when the number of nonce digits changes. The compiled loop
+releases the GIL (nogil=True).
+"""
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+# Nonces tried per call into the compiled kernel.
+CHUNK = 1 << 20
+
+_M32 = 0xFFFFFFFF
+
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+
+@njit(cache=True, nogil=True)
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _M32
+
+
+@njit(cache=True, nogil=True)
+def _compress(state, buf, off, w):
+    """One SHA-256 compression of buf[off:off+64] into state (uint32 words held in int64)."""
+    for t in range(16):
+        j = off + 4 * t
+        w[t] = (int(buf[j]) << 24) | (int(buf[j + 1]) << 16) | (int(buf[j + 2]) << 8) | int(buf[j + 3])
+    for t in range(16, 64):
+        x = w[t - 15]
+        y = w[t - 2]
+        s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+        s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> 10)
+        w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & _M32
+
+    a, b, c, d = state[0], state[1], state[2], state[3]
+    e, f, g, h = state[4], state[5], state[6], state[7]
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ ((e ^ _M32) & g)
+        t1 = (h + s1 + ch + _K[t] + w[t]) & _M32
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & _M32
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _M32
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _M32
+    state[0] = (state[0] + a) & _M32
+    state[1] = (state[1] + b) & _M32
+    state[2] = (state[2] + c) & _M32
+    state[3] = (state[3] + d) & _M32
+    state[4] = (state[4] + e) & _M32
+    state[5] = (state[5] + f) & _M32
+    state[6] = (state[6] + g) & _M32
+    state[7] = (state[7] + h) & _M32
+
+
+@njit(cache=True, nogil=True)
+def _meets(state, difficulty):
+    """True if the digest starts with `difficulty` zero hex digits."""
+    full = difficulty // 8
+    for j in range(full):
+        if state[j] != 0:
+            return False
+    rem = difficulty % 8
+    if rem:
+        return (state[full] >> (32 - 4 * rem)) == 0
+    return True
+
+
+@njit(cache=True, nogil=True)
+def _search(prefix, suffix, difficulty, start, stride, count, out_state):
+    """Try `count` nonces start, start+stride, ...; return the hit (digest in out_state) or -1."""
+    plen = len(prefix)
+    slen = len(suffix)
+    buf = np.zeros(plen + 20 + slen + 72, dtype=np.uint8)
+    buf[:plen] = prefix
+    w = np.zeros(64, dtype=np.int64)
+    mid = np.zeros(8, dtype=np.int64)
+    state = np.zeros(8, dtype=np.int64)
+    digits = np.zeros(20, dtype=np.uint8)
+    first_var = plen // 64
+    ndig_cur = -1
+    total = 0
+    nonce = start
+    for _ in range(count):
+        n = nonce
+        nd = 0
+        while True:
+            digits[nd] = 48 + n % 10
+            n //= 10
+            nd += 1
+            if n == 0:
+                break
+        if nd != ndig_cur:
+            # the suffix moves whenever the nonce gains a digit: redo layout, padding and midstate
+            ndig_cur = nd
+            mlen = plen + nd + slen
+            buf[plen + nd:mlen] = suffix
+            total = ((mlen + 9 + 63) // 64) * 64
+            buf[mlen] = 0x80
+            for j in range(mlen + 1, total - 8):
+                buf[j] = 0
+            bits = mlen * 8
+            for j in range(8):
+                buf[total - 1 - j] = (bits >> (8 * j)) & 0xFF
+            for j in range(8):
+                mid[j] = _H0[j]
+            for blk in range(first_var):
+                _compress(mid, buf, blk * 64, w)
+        for j in range(nd):
+            buf[plen + j] = digits[nd - 1 - j]
+        for j in range(8):
+            state[j] = mid[j]
+        for blk in range(first_var, total // 64):
+            _compress(state, buf, blk * 64, w)
+        if _meets(state, difficulty):
+            for j in range(8):
+                out_state[j] = state[j]
+            return nonce
+        nonce += stride
+    return -1
+
+
+def pow_search(prefix: bytes, suffix: bytes, difficulty: int, start: int = 0,
+               stride: int = 1) -> Tuple[int, str]:
+    """Scan nonces start, start+stride, ... until sha256(prefix + nonce + suffix) meets difficulty."""
+    p = np.frombuffer(prefix, dtype=np.uint8)
+    s = np.frombuffer(suffix, dtype=np.uint8)
+    out = np.zeros(8, dtype=np.int64)
+    while True:
+        nonce = _search(p, s, difficulty, start, stride, CHUNK, out)
+        if nonce >= 0:
+            return int(nonce), "".join("%08x" % int(x) for x in out)
+        start += CHUNK * stride
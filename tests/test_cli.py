@@ -0,0 +1,98 @@
+"""
+CLI tests: the .cache.pkl hit/miss rules and new-tx --batch errors, run against a copy of
+src/ so the project's own data/ is never touched.
+Run: python -m unittest discover -s tests
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        shutil.copytree(SRC_DIR, os.path.join(self.root, "src"),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        self.cli("init")
+
+    def cli(self, *args, root=None, check=True) -> subprocess.CompletedProcess:
+        proc = subprocess.run([sys.executable, os.path.join(root or self.root, "src", "cli.py"), *args],
+                              capture_output=True, text=True)
+        if check:
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc
+
+    def mempool(self, root=None) -> list:
+        path = os.path.join(root or self.root, "data", "mempool.json")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def plant_marker(self, root=None):
+        """Re-save the cache with a balance for "marker" that only the cached object has."""
+        script = ("import cli; bc = cli.load_blockchain(); "
+                  "bc._by_addr['marker'] = {('t', 0): 7}; cli._write_cache(bc)")
+        subprocess.run([sys.executable, "-c", script], cwd=os.path.join(root or self.root, "src"), check=True)
+
+    def marker_balance(self, root=None) -> str:
+        return self.cli("balance", "--addr", "marker", root=root).stdout.strip()
+
+    def test_cache_hit(self):
+        self.plant_marker()
+        self.assertEqual(self.marker_balance(), "Balance of marker: 7")
+
+    def test_cache_miss_when_a_data_file_changes(self):
+        self.plant_marker()
+        path = os.path.join(self.root, "data", "mempool.json")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.marker_balance(), "Balance of marker: 0")
+
+    def test_cache_is_not_reused_by_a_copied_project(self):
+        self.plant_marker()
+        copy_root = os.path.join(self.root, "copy")
+        os.mkdir(copy_root)
+        for name in ("src", "data"):  # copy2 keeps the mtimes, like cp -a
+            shutil.copytree(os.path.join(self.root, name), os.path.join(copy_root, name))
+        self.assertEqual(self.marker_balance(root=copy_root), "Balance of marker: 0")
+
+        self.cli("new-tx", "--from", "alice", "--to", "bob", "--amount", "1", root=copy_root)
+        self.assertEqual(len(self.mempool(root=copy_root)), 1)
+        self.assertEqual(self.mempool(), [])
+
+    def test_batch_file_errors_exit_with_a_message(self):
+        missing = os.path.join(self.root, "missing.json")
+        not_a_list = os.path.join(self.root, "five.json")
+        not_json = os.path.join(self.root, "bad.json")
+        with open(not_a_list, "w", encoding="utf-8") as f:
+            f.write("5")
+        with open(not_json, "w", encoding="utf-8") as f:
+            f.write("[{")
+        for path, message in ((missing, "Cannot read the --batch file"),
+                              (not_json, "Cannot read the --batch file"),
+                              (not_a_list, "must hold a JSON list of transactions, not int")):
+            with self.subTest(path=os.path.basename(path)):
+                proc = self.cli("new-tx", "--batch", path, check=False)
+                self.assertEqual(proc.returncode, 1)
+                self.assertIn(message, proc.stderr)
+                self.assertNotIn("Traceback", proc.stderr)
+        self.assertEqual(self.mempool(), [])
+
+    def test_batch_reports_invalid_entries(self):
+        path = os.path.join(self.root, "txs.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([5, {"inputs": [{"txid": ["x"], "index": 0, "address": "a"}], "outputs": []}], f)
+        proc = self.cli("new-tx", "--batch", path, "--workers", "2")
+        self.assertIn("Transaction #0 invalid!", proc.stdout)
+        self.assertIn("Transaction #1 invalid!", proc.stdout)
+        self.assertIn("0 of 2 transactions added to mempool.", proc.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Hashing regression tests: the hand-rolled/streamed encoders must hash exactly like
+sha256_json (sorted keys, compact, ensure_ascii=False), which is what every stored
+txid and block hash was computed with.
+Run: python -m unittest discover -s tests
+"""
+import json
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blockchain import Block, Transaction, canonical_json, sha256_canon, sha256_json  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+# block hashes of data/chain.json, as computed by the original sort_keys json.dumps code
+# (the file itself stores "hash": null)
+DATA_BLOCK_HASHES = [
+    "000d6bda13dd6a9c2c5f72e48726d5bfe2f2ffee9b2935d07e94372deec6dfe3",
+    "00075216bcc4942d4384084ebc6c90f7246827f7f1a551679448f3dac859f408",
+]
+
+
+def _block_content(b: Block) -> dict:
+    return {"index": b.index, "transactions": b.transactions, "timestamp": b.timestamp,
+            "previous_hash": b.previous_hash, "nonce": b.nonce}
+
+
+def _rand_str(rng: random.Random) -> str:
+    alphabet = "abcxyz019 \"\\/\n\té中\U0001f600\x00\x1f "
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def _rand_scalar(rng: random.Random):
+    return rng.choice([
+        rng.randint(-10, 10), rng.randint(0, 1 << 70), rng.random() * 1e6, 1e300, -0.0,
+        True, False, None, _rand_str(rng), "COINBASE",
+    ])
+
+
+def _rand_io(rng: random.Random):
+    """Random (inputs, outputs) in the tx schema, with arbitrary JSON scalars as values."""
+    inputs = [{"txid": rng.choice([_rand_str(rng), "%064x" % rng.getrandbits(256)]),
+               "index": rng.choice([rng.randint(0, 5), _rand_scalar(rng)]),
+               "address": rng.choice(["alice", _rand_scalar(rng)])}
+              for _ in range(rng.randint(0, 3))]
+    outputs = [{"amount": rng.choice([rng.randint(1, 100), _rand_scalar(rng)]),
+                "address": _rand_str(rng)}
+               for _ in range(rng.randint(0, 3))]
+    return inputs, outputs
+
+
+def _rand_off_schema(rng: random.Random) -> dict:
+    """A tx-like dict with extra/missing keys or odd values, for the canonical_json fallback."""
+    inputs, outputs = _rand_io(rng)
+    if inputs:
+        inputs[0]["extra"] = _rand_scalar(rng)
+    if outputs:
+        del outputs[0]["address"]
+    outputs.append([_rand_scalar(rng), {"k": _rand_scalar(rng)}])
+    return rng.choice([{"inputs": inputs, "outputs": outputs},
+                       {"txid": _rand_str(rng), "inputs": inputs, "outputs": outputs, "z": 1},
+                       {"inputs": _rand_scalar(rng), "outputs": outputs}])
+
+
+class DataFixtureTests(unittest.TestCase):
+    def test_stored_txids_recompute(self):
+        with open(os.path.join(DATA_DIR, "chain.json"), encoding="utf-8") as f:
+            chain = json.load(f)
+        with open(os.path.join(DATA_DIR, "mempool.json"), encoding="utf-8") as f:
+            mempool = json.load(f)
+        txs = [t for b in chain for t in b["transactions"]] + mempool
+        self.assertTrue(txs)
+        for t in txs:
+            self.assertEqual(Transaction(t["inputs"], t["outputs"]).txid, t["txid"])
+            self.assertEqual(sha256_canon({"inputs": t["inputs"], "outputs": t["outputs"]}), t["txid"])
+
+    def test_stored_block_hashes_recompute(self):
+        with open(os.path.join(DATA_DIR, "chain.json"), encoding="utf-8") as f:
+            chain = [Block.from_dict(b) for b in json.load(f)]
+        self.assertEqual(len(chain), len(DATA_BLOCK_HASHES))
+        for block, expected in zip(chain, DATA_BLOCK_HASHES):
+            self.assertEqual(block.compute_hash(), expected)
+            self.assertEqual(block.compute_hash_with_nonce(block.nonce), expected)
+            self.assertEqual(sha256_json(_block_content(block)), expected)
+            self.assertTrue(expected.startswith("0" * block.difficulty))
+
+
+class CanonicalJsonTests(unittest.TestCase):
+    def test_random_txs_match_canonical_json(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            inputs, outputs = _rand_io(rng)
+            tx = Transaction(inputs, outputs).to_dict()
+            content = {"inputs": inputs, "outputs": outputs}
+            expected = sha256_json(content)
+            self.assertEqual(tx["txid"], expected, canonical_json(content))
+            self.assertEqual(sha256_canon(content), expected)
+            self.assertEqual(sha256_canon(tx), sha256_json(tx))
+            stored = dict(content, txid=_rand_scalar(rng))
+            self.assertEqual(sha256_canon(stored), sha256_json(stored))
+
+    def test_off_schema_falls_back_to_canonical_json(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            obj = _rand_off_schema(rng)
+            self.assertEqual(sha256_canon(obj), sha256_json(obj))
+            self.assertEqual(sha256_canon([obj, obj]), sha256_json([obj, obj]))
+
+    def test_random_blocks_match_canonical_json(self):
+        rng = random.Random(99)
+        for _ in range(300):
+            txs = [Transaction(*_rand_io(rng)).to_dict() for _ in range(rng.randint(0, 4))]
+            if rng.random() < 0.2:
+                txs.append(_rand_off_schema(rng))
+            if txs and rng.random() < 0.3:
+                txs[0]["txid"] = _rand_str(rng)
+            block = Block(index=rng.choice([rng.randint(0, 1 << 40), _rand_scalar(rng)]), transactions=txs,
+                          timestamp=rng.choice([rng.random() * 2e9, rng.randint(0, 2 ** 40), _rand_scalar(rng)]),
+                          previous_hash=rng.choice(["0", None, "%064x" % rng.getrandbits(256), _rand_scalar(rng)]),
+                          nonce=rng.randint(0, 10 ** 7))
+            expected = sha256_json(_block_content(block))
+            self.assertEqual(block.compute_hash(), expected)
+            self.assertEqual(block.compute_hash_with_nonce(block.nonce), expected)
+            self.assertEqual(sha256_canon(txs), sha256_json(txs))
+            h0, suffix = block._pow_prefix_and_midstate()
+            h0.update(b"%d" % block.nonce)
+            h0.update(suffix)
+            self.assertEqual(h0.hexdigest(), expected)
+
+    def test_mined_block_meets_target(self):
+        block = Block(index=1, transactions=[Transaction.coinbase("miner", 50, 1).to_dict()],
+                      timestamp=1.5, previous_hash="0" * 64)
+        digest = block.mine(difficulty=2)
+        self.assertTrue(digest.startswith("00"))
+        self.assertEqual(digest, sha256_json(_block_content(block)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Mempool tests: add_new_transactions (sequential and spread over worker processes) must
+end in the same state as calling add_new_transaction once per tx.
+Run: python -m unittest discover -s tests
+"""
+import copy
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blockchain import PARALLEL_VALIDATION_MIN, Blockchain, Transaction  # noqa: E402
+
+
+def _tx(inputs, outputs) -> dict:
+    return Transaction(inputs, outputs).to_dict()
+
+
+def _batch(bc: Blockchain, n: int, rng: random.Random) -> list:
+    """n txs over bc's utxos: valid spends, chains, double spends, invalid and malformed ones."""
+    coins = [(k, u.amount, u.address) for k, u in bc.utxos.items()]
+    made = []  # (outpoint, amount, address) created by earlier txs in the batch
+    txs = []
+    for _ in range(n):
+        r = rng.random()
+        (txid, idx), amount, addr = rng.choice(made) if made and r < 0.35 else rng.choice(coins)
+        inputs = [{"txid": txid, "index": idx, "address": addr}]
+        outputs = [{"amount": amount // 2 or 1, "address": rng.choice("xyz")},
+                   {"amount": amount - (amount // 2 or 1) or 1, "address": addr}]
+        if r > 0.9:
+            bad = rng.choice(["index", "unhashable", "amount", "address", "coinbase", "txid", "shape"])
+            if bad == "index":
+                inputs[0]["index"] = "bad"
+            elif bad == "unhashable":
+                inputs[0]["txid"] = [txid]
+            elif bad == "amount":
+                outputs[0]["amount"] = "x"
+            elif bad == "address":
+                inputs[0]["address"] = "mallory"
+            elif bad == "coinbase":
+                inputs = [{"txid": "COINBASE", "index": 0, "address": "COINBASE"}]
+            elif bad == "txid":
+                tx = _tx(inputs, outputs)
+                tx["txid"] = "0" * 64
+                txs.append(tx)
+                continue
+            else:
+                txs.append({"inputs": inputs[0], "outputs": outputs})
+                continue
+        tx = _tx(inputs, outputs)
+        txs.append(tx)
+        for i, o in enumerate(outputs):
+            if type(o["amount"]) is int:
+                made.append(((tx["txid"], i), o["amount"], o["address"]))
+    return txs
+
+
+def _state(bc: Blockchain):
+    return (bc.unconfirmed_transactions, bc._mempool_spent, bc._mempool_outputs,
+            {a: d for a, d in bc._mp_delta.items() if d})
+
+
+class BatchAddTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        bc = Blockchain(data_dir=self.dir, difficulty=1)
+        for n in range(12):
+            bc.mine("abc"[n % 3])
+        # one tx already pending, so the batch also has to see the existing overlay
+        (txid, idx), amount = next(iter(bc._by_addr["a"].items()))
+        self.assertTrue(bc.add_new_transaction(
+            _tx([{"txid": txid, "index": idx, "address": "a"}], [{"amount": amount, "address": "b"}])))
+        self.base = bc
+
+    def _copy(self) -> Blockchain:
+        bc = copy.deepcopy(self.base)
+        bc.save_to_file = lambda: None
+        return bc
+
+    def test_batch_matches_one_by_one(self):
+        txs = _batch(self.base, PARALLEL_VALIDATION_MIN + 100, random.Random(3))
+
+        one_by_one = self._copy()
+        expected = [one_by_one.add_new_transaction(copy.deepcopy(tx)) for tx in txs]
+        self.assertTrue(any(expected))
+        self.assertFalse(all(expected))
+
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                bc = self._copy()
+                self.assertEqual(bc.add_new_transactions(copy.deepcopy(txs), workers=workers), expected)
+                self.assertEqual(_state(bc), _state(one_by_one))
+
+        # the incrementally kept overlay matches one rebuilt from scratch
+        one_by_one._rebuild_mempool_overlay()
+        self.assertEqual(_state(one_by_one)[1:], _state(bc)[1:])
+
+    def test_unhashable_txid_is_rejected_in_parallel_too(self):
+        (txid, idx), amount = next(iter(self.base._by_addr["b"].items()))
+        bad = _tx([{"txid": [txid], "index": idx, "address": "b"}], [{"amount": amount, "address": "z"}])
+        good = _tx([{"txid": txid, "index": idx, "address": "b"}], [{"amount": amount, "address": "z"}])
+        txs = [bad] + [good] * PARALLEL_VALIDATION_MIN
+        sequential = self._copy()
+        expected = sequential.add_new_transactions(copy.deepcopy(txs), workers=1)
+        self.assertEqual(expected[:3], [False, True, False])
+        bc = self._copy()
+        self.assertEqual(bc.add_new_transactions(copy.deepcopy(txs), workers=2), expected)
+        self.assertEqual(_state(bc), _state(sequential))
+
+    def test_batch_is_saved(self):
+        txs = _batch(self.base, 20, random.Random(4))
+        results = self.base.add_new_transactions(txs)
+        loaded = Blockchain(data_dir=self.dir, difficulty=1)
+        self.assertEqual(len(loaded.unconfirmed_transactions), 1 + sum(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
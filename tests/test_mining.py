@@ -0,0 +1,105 @@
+"""
+Mining tests: a mine() that fails part-way leaves the chain and UTXO set as they were.
+Run: python -m unittest discover -s tests
+"""
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blockchain import PARALLEL_VALIDATION_MIN, Block, Blockchain, Transaction  # noqa: E402
+
+
+class MineRollbackTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.bc = Blockchain(data_dir=self.dir, difficulty=1)
+        for miner in ("a", "b"):
+            self.bc.mine(miner)
+        for owner in ("a", "b"):
+            (txid, idx), amount = next(iter(self.bc._by_addr[owner].items()))
+            self.assertTrue(self.bc.add_new_transaction(Transaction(
+                [{"txid": txid, "index": idx, "address": owner}], [{"amount": amount, "address": "c"}]).to_dict()))
+
+    def _assert_unchanged(self, utxos, chain_len):
+        self.assertEqual(self.bc.utxos, utxos)
+        self.assertEqual(len(self.bc.chain), chain_len)
+        self.assertEqual(len(self.bc.unconfirmed_transactions), 2)
+        self.assertTrue(self.bc.is_chain_valid())
+
+    def test_interrupted_pow_rolls_back(self):
+        utxos, chain_len = dict(self.bc.utxos), len(self.bc.chain)
+        with mock.patch.object(Block, "mine", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.bc.mine("m")
+        self._assert_unchanged(utxos, chain_len)
+
+    def test_failure_during_mempool_validation_rolls_back(self):
+        utxos, chain_len = dict(self.bc.utxos), len(self.bc.chain)
+        real = Blockchain._validate_and_apply_to_utxo
+        calls = []
+
+        def fail_on_second(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("boom")
+            return real(*args, **kwargs)
+
+        self.bc._validate_and_apply_to_utxo = fail_on_second
+        with self.assertRaises(RuntimeError):
+            self.bc.mine("m")
+        del self.bc._validate_and_apply_to_utxo
+        self._assert_unchanged(utxos, chain_len)
+
+        # and a later mine still works from the restored state
+        self.bc.mine("m")
+        self.assertEqual(len(self.bc.chain), chain_len + 1)
+        self.assertEqual(self.bc.unconfirmed_transactions, [])
+        self.assertTrue(self.bc.is_chain_valid())
+
+
+class ParallelMineTests(unittest.TestCase):
+    def test_malformed_entries_are_left_out_like_in_the_sequential_pass(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        bc = Blockchain(data_dir=tmp, difficulty=1)
+        for miner in ("a", "b", "a"):
+            bc.mine(miner)
+        mempool = []
+        for (txid, idx), utxo in bc.utxos.items():
+            mempool.append(Transaction([{"txid": txid, "index": idx, "address": utxo.address}],
+                                       [{"amount": utxo.amount, "address": "z"}]).to_dict())
+        # entries that hash to their txid but can't be validated: unhashable txid, bad index
+        mempool.append(Transaction([{"txid": ["x"], "index": 0, "address": "a"}],
+                                   [{"amount": 1, "address": "z"}]).to_dict())
+        mempool.append(Transaction([{"txid": {"k": 1}, "index": 0, "address": "a"}],
+                                   [{"amount": 1, "address": "z"}]).to_dict())
+        mempool.append(Transaction([{"txid": "t", "index": "bad", "address": "a"}],
+                                   [{"amount": 1, "address": "z"}]).to_dict())
+        while len(mempool) < PARALLEL_VALIDATION_MIN + 10:
+            n = len(mempool)
+            mempool.append(Transaction([{"txid": "%064x" % n, "index": 0, "address": "a"}],
+                                       [{"amount": 1, "address": "z"}]).to_dict())
+        bc.unconfirmed_transactions = mempool
+        bc._rebuild_mempool_overlay()
+
+        results = {}
+        for workers in (1, 2):
+            copy_ = copy.deepcopy(bc)
+            copy_.save_to_file = lambda: None
+            copy_.mining_workers = workers
+            copy_.mine("m")
+            results[workers] = (copy_.chain[-1].transactions[1:], copy_.utxos, copy_.unconfirmed_transactions)
+            self.assertTrue(copy_.is_chain_valid())
+        self.assertEqual(len(results[1][0]), len(bc.utxos))
+        self.assertEqual(results[1], results[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+On-disk format tests: chain.log frames, the utxos.json snapshot + utxos.log deltas,
+mempool.json, and loading/migrating the legacy files in data/.
+Run: python -m unittest discover -s tests
+"""
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blockchain import Block, Blockchain, Transaction  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def _read_frames(path: str) -> list:
+    with open(path, "rb") as f:
+        raw = f.read()
+    out, pos = [], 0
+    while pos < len(raw):
+        (n,) = struct.unpack_from("<I", raw, pos)
+        out.append(raw[pos + 4:pos + 4 + n])
+        pos += 4 + n
+    return out
+
+
+class PersistenceTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _spend(self, bc: Blockchain, owner: str, to: str) -> dict:
+        (txid, idx), amount = next(iter(bc._by_addr[owner].items()))
+        tx = Transaction([{"txid": txid, "index": idx, "address": owner}],
+                         [{"amount": amount - 1, "address": to}, {"amount": 1, "address": owner}]).to_dict()
+        self.assertTrue(bc.add_new_transaction(tx))
+        return tx
+
+    def test_round_trip(self):
+        bc = Blockchain(data_dir=self.dir, difficulty=1)
+        for miner in ("a", "b", "a"):
+            bc.mine(miner)
+        self._spend(bc, "a", "c")
+        bc.mine("b")
+        pending = self._spend(bc, "b", "d")
+
+        loaded = Blockchain(data_dir=self.dir, difficulty=1)
+        self.assertEqual([b.to_dict() for b in loaded.chain], [b.to_dict() for b in bc.chain])
+        self.assertEqual(loaded.utxos, bc.utxos)
+        self.assertEqual(loaded.unconfirmed_transactions, [pending])
+        self.assertEqual(loaded._mp_delta, bc._mp_delta)
+        self.assertTrue(loaded.is_chain_valid())
+
+    def test_amounts_beyond_64_bits_round_trip(self):
+        bc = Blockchain(data_dir=self.dir, difficulty=1, block_reward=2 ** 64)
+        bc.mine("a")
+        self._spend(bc, "a", "b")
+
+        loaded = Blockchain(data_dir=self.dir, difficulty=1, block_reward=2 ** 64)
+        self.assertEqual([b.to_dict() for b in loaded.chain], [b.to_dict() for b in bc.chain])
+        for block in loaded.chain:
+            self.assertIs(type(block.transactions[0]["outputs"][0]["amount"]), int)
+            self.assertEqual(block.compute_hash(), block.hash)
+        self.assertTrue(all(type(u.amount) is int for u in loaded.utxos.values()))
+        self.assertEqual(loaded.utxos, bc.utxos)
+        self.assertEqual(loaded.unconfirmed_transactions, bc.unconfirmed_transactions)
+        # (is_chain_valid() rejects such amounts either way: they don't fit UtxoSet's 64-bit column)
+
+    def test_chain_log_records(self):
+        bc = Blockchain(data_dir=self.dir, difficulty=1)
+        bc.mine("a")
+        bc.mine("b")
+        frames = _read_frames(os.path.join(self.dir, "chain.log"))
+        self.assertEqual(frames, [b.to_json() for b in bc.chain])
+        for frame, block in zip(frames, bc.chain):
+            self.assertEqual(json.loads(frame), block.to_dict())
+            self.assertEqual(Block.from_json(frame).to_dict(), block.to_dict())
+            self.assertEqual(Block.from_json(frame).compute_hash(), block.hash)
+
+    def test_utxo_snapshot_and_log(self):
+        bc = Blockchain(data_dir=self.dir, difficulty=1)
+        with open(os.path.join(self.dir, "utxos.json"), encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self.assertEqual(sorted(map(tuple, snapshot)),
+                         sorted((k[0], k[1], u.amount, u.address) for k, u in bc.utxos.items()))
+
+        self._spend(bc, "alice", "z")
+        bc.mine("m")
+        deltas = [json.loads(r) for r in _read_frames(os.path.join(self.dir, "utxos.log"))]
+        self.assertEqual(len(deltas), 1)
+        self.assertEqual(len(deltas[0]["spent"]), 1)
+        self.assertEqual(len(deltas[0]["added"]), 3)  # coinbase + payment + change
+
+        loaded = Blockchain(data_dir=self.dir, difficulty=1)
+        self.assertEqual(loaded.utxos, bc.utxos)
+        self.assertEqual(loaded._by_addr, bc._by_addr)
+
+    def test_mempool_entries_with_wrong_txid_are_dropped_from_the_file(self):
+        bc = Blockchain(data_dir=self.dir, difficulty=1)
+        bc.mine("a")
+        good = self._spend(bc, "a", "b")
+        forged = dict(self._spend(bc, "alice", "b"), txid="0" * 64)
+        path = os.path.join(self.dir, "mempool.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([good, forged], f)
+
+        loaded = Blockchain(data_dir=self.dir, difficulty=1)
+        self.assertEqual(loaded.unconfirmed_transactions, [good])
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [good])
+
+    def test_legacy_files_load_and_migrate(self):
+        for name in ("chain.json", "utxos.json", "mempool.json"):
+            shutil.copy(os.path.join(DATA_DIR, name), self.dir)
+        with open(os.path.join(DATA_DIR, "chain.json"), encoding="utf-8") as f:
+            legacy_chain = json.load(f)
+        with open(os.path.join(DATA_DIR, "utxos.json"), encoding="utf-8") as f:
+            legacy_utxos = json.load(f)
+
+        bc = Blockchain(data_dir=self.dir)
+        self.assertEqual(len(bc.chain), len(legacy_chain))
+        self.assertEqual({(u["txid"], u["index"]): (u["amount"], u["address"]) for u in legacy_utxos},
+                         {k: (u.amount, u.address) for k, u in bc.utxos.items()})
+        self.assertEqual(len(bc.unconfirmed_transactions), 1)
+
+        bc.save_to_file()
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "chain.log")))
+        migrated = Blockchain(data_dir=self.dir)
+        self.assertEqual([b.to_dict() for b in migrated.chain], [b.to_dict() for b in bc.chain])
+        self.assertEqual(migrated.utxos, bc.utxos)
+        self.assertEqual(migrated.unconfirmed_transactions, bc.unconfirmed_transactions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Chain validation tests, full and incremental (is_chain_valid(incremental=True)).
+Run: python -m unittest discover -s tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blockchain import Blockchain  # noqa: E402
+
+
+class ValidationTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.bc = Blockchain(data_dir=self.dir, difficulty=1)
+        for miner in ("a", "b", "c"):
+            self.bc.mine(miner)
+        self.assertTrue(self.bc.is_chain_valid(incremental=True))
+
+    def test_incremental_resumes_after_new_blocks(self):
+        self.bc.mine("d")
+        self.assertTrue(self.bc.is_chain_valid(incremental=True))
+        self.assertTrue(self.bc.is_chain_valid())
+
+    def test_tampered_tip_is_caught_incrementally(self):
+        self.bc.chain[-1].transactions[0]["outputs"][0]["amount"] = 999
+        self.assertFalse(self.bc.is_chain_valid(incremental=True))
+        self.assertFalse(self.bc.is_chain_valid())
+
+    def test_tampered_earlier_block_needs_full_run(self):
+        self.bc.chain[1].transactions[0]["outputs"][0]["amount"] = 999
+        self.assertFalse(self.bc.is_chain_valid())
+        # the failed full run dropped the cache, so the incremental check replays everything too
+        self.assertFalse(self.bc.is_chain_valid(incremental=True))
+
+
+if __name__ == "__main__":
+    unittest.main()